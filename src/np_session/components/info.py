@@ -1,18 +1,22 @@
 from __future__ import annotations
 
 import abc
+import concurrent.futures
+import contextlib
 import datetime
 import enum
 import functools
 import time
-from typing import Any, ClassVar, MutableMapping, Optional
+import weakref
+from typing import Any, ClassVar, Iterable, MutableMapping, Optional
 
 import np_logging
-from backports.cached_property import cached_property
 from typing_extensions import Literal, Protocol, runtime_checkable
 
+from np_session.components.mixins import WithState, fast_cached_property
 from np_session.databases import State
 from np_session.databases.lims2 import (
+    LIMS2InfoBaseClass,
     LIMS2MouseInfo,
     LIMS2ProjectInfo,
     LIMS2UserInfo,
@@ -22,27 +26,128 @@ from np_session.databases.mtrain import MTrain
 logger = np_logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1024)
+def _get_lims_mouse(mouse_id: int) -> LIMS2MouseInfo | dict:
+    """Shared across `Mouse` instances so each ID is only fetched from lims once."""
+    try:
+        return LIMS2MouseInfo(mouse_id)
+    except ValueError:
+        return {}
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_lims_user(lims_user_id: str) -> LIMS2UserInfo | dict:
+    """Shared across `User` instances so each ID is only fetched from lims once."""
+    try:
+        return LIMS2UserInfo(lims_user_id)
+    except ValueError:
+        return {}
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_lims_project(lims_project_name: str) -> LIMS2ProjectInfo:
+    """Shared across `Project` instances so each ID is only fetched from lims once."""
+    return LIMS2ProjectInfo(lims_project_name)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_project_state(name: str) -> State:
+    """`Projects` members are singletons, so their state objects can be shared."""
+    return State(name)
+
+
 class InfoBaseClass(abc.ABC):
-    """Store details for an object from various databases. The commonly-used format of its name, e.g. '366122' for a mouse ID, can be obtained by converting to str()."""
+    """Store details for an object from various databases. The commonly-used format of its name, e.g. '366122' for a mouse ID, can be obtained by converting to str().
+
+    Copies and unpickled instances are the same interned object:
+    >>> import pickle
+    >>> mouse = Mouse(366122)
+    >>> pickle.loads(pickle.dumps(mouse)) is mouse
+    True
+    """
+
+    __slots__ = ('id', '_str', '_repr', '_hash', '__weakref__')
+    # subclasses add slots for their cached properties (`_lims`, `_state`, ...)
 
     id: int | str
     "Commonly-used format of the object's value among the neuropixels team e.g. for a mouse -> the labtracks ID (366122)."
 
+    _type: ClassVar[type] = str
+    """Type `id` is normalized to on construction."""
+
+    _instances: ClassVar[weakref.WeakValueDictionary] = weakref.WeakValueDictionary()
+    """Live instances keyed by `(cls, id)`, so each ID maps to a single object."""
+
+    _name_hash: ClassVar[int]
+    """Hash of the class name, computed once per subclass."""
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._name_hash = hash(cls.__name__)
+
+    def __new__(cls, id: Any, *args, **kwargs):
+        # `id` is normalized and assigned once here: `__init__` has nothing left to do
+        if id.__class__ is not cls._type:
+            id = cls._type(str(id))
+        key = (cls, id)
+        obj = cls._instances.get(key)
+        if obj is None:
+            obj = super().__new__(cls)
+            obj.id = id
+            obj._precompute()
+            cls._instances[key] = obj
+        return obj
+
+    def __reduce__(self):
+        # `__new__` requires `id`: rebuild via the intern table
+        return (self.__class__, (self.id,))
+
+    @classmethod
+    def prefetch(cls, ids: Iterable[int | str], max_workers: int = 16) -> None:
+        """Fetch lims info for many ids concurrently, so subsequent
+        `cls(id).lims` access doesn't wait on the network.
+
+        Failures are logged, not raised: the ids affected are fetched again on
+        access, as if never prefetched."""
+
+        def fetch(id: int | str) -> None:
+            try:
+                lims = cls(id).lims
+                if isinstance(lims, LIMS2InfoBaseClass):
+                    lims.fetch()
+            except Exception as exc:
+                logger.warning(
+                    'Failed to prefetch `%s(%r).lims`: %r', cls.__name__, id, exc
+                )
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            tuple(executor.map(fetch, ids))
+
+    def _precompute(self) -> None:
+        """Precompute `str`, `repr` and `hash` once `id` is set: instances are immutable."""
+        self._str = str(self.id)
+        self._repr = f'{self.__class__.__name__}({self.id!r})'
+        self._hash = hash(self.id) ^ self._name_hash
+
     def __str__(self) -> str:
-        return str(self.id)
+        return self._str
 
     def __repr__(self) -> str:
-        return f'{self.__class__.__name__}({self.id!r})'
+        return self._repr
 
     def __eq__(self, other: Any) -> bool:
-        if not isinstance(other, (int, str, InfoBaseClass)):
-            return NotImplemented
-        if isinstance(other, Mouse):
+        if other.__class__ is self.__class__ or isinstance(other, Mouse):
             return self.id == other.id
-        return str(self) == str(other) or str(self.id) == str(other)
+        if isinstance(other, str):
+            return self._str == other
+        if isinstance(other, InfoBaseClass):
+            return self._str == other._str
+        if isinstance(other, int):
+            return self._str == str(other)
+        return NotImplemented
 
     def __hash__(self) -> int:
-        return hash(self.id) ^ hash(self.__class__.__name__)
+        return self._hash
 
 
 @runtime_checkable
@@ -51,6 +156,8 @@ class WithLims(Protocol):
     lims2 data.
     """
 
+    __slots__ = ()
+
     id: int | str
     """Lims2 ID for the object."""
 
@@ -58,39 +165,20 @@ class WithLims(Protocol):
     """lims2 data as a dict (may be empty)."""
 
 
-@runtime_checkable
-class WithState(Protocol):
-    """Protocol for types that have a `state` attribute for persisting
-    metadata. Can also be used as a mixin to provide basic state implementation.
-    """
-
-    id: int | str
-    """Unique identifier for the object. This is used as the key for the object's state in the database."""
-
-    @property
-    def state(self) -> MutableMapping[str, Any]:
-        try:
-            return State(self.id)
-        except Exception as exc:
-            logger.error('Failed to load `%r.state`: %r', self, exc)
-        return {}
+class Mouse(WithLims, WithState, InfoBaseClass):
+    __slots__ = ('_lims', '_mtrain', '_state')
 
+    _type = int
 
-class Mouse(WithLims, WithState, InfoBaseClass):
     def __init__(self, labtracks_mouse_id: str | int | Mouse):
-        self.id = int(str(labtracks_mouse_id))
+        pass   # `id` is assigned in `InfoBaseClass.__new__`
 
-    @property
+    @fast_cached_property
     def lims(self) -> LIMS2MouseInfo | dict:
         """Lims info for the mouse."""
-        if not hasattr(self, '_lims'):
-            try:
-                self._lims = LIMS2MouseInfo(self.id)
-            except ValueError:
-                self._lims = {}
-        return self._lims
+        return _get_lims_mouse(self.id)
 
-    @cached_property
+    @fast_cached_property
     def mtrain(self) -> MTrain:
         """Lims info for the mouse."""
         return MTrain(self.id)
@@ -102,22 +190,15 @@ class Mouse(WithLims, WithState, InfoBaseClass):
 
 
 class User(WithState, InfoBaseClass):
+    __slots__ = ('_lims', '_state')
+
     def __init__(self, lims_user_id: str | User):
-        self.id = str(lims_user_id)
+        pass   # `id` is assigned in `InfoBaseClass.__new__`
 
-    @cached_property
+    @fast_cached_property
     def lims(self) -> LIMS2UserInfo | dict:
         """Lims info for the user."""
-        if not hasattr(self, '_lims'):
-            try:
-                self._lims = LIMS2UserInfo(self.id)
-            except ValueError:
-                self._lims = {}
-        return self._lims
-
-
-# class ProjectsEnum(abc.ABCMeta, enum.EnumMeta, type):
-#     pass
+        return _get_lims_user(self.id)
 
 
 class Projects(enum.Enum):
@@ -143,6 +224,9 @@ class Projects(enum.Enum):
     TTN = ('TaskTrainedNetworksNeuropixel',)
     NP = ('NeuropixelPlatformDevelopment',)
 
+    _value_set: frozenset[str]
+    """`value` as a set, for fast membership tests (assigned once, below the class)."""
+
     @property
     def id(self) -> str:
         return str(self.name)
@@ -150,53 +234,76 @@ class Projects(enum.Enum):
     @property
     def state(self) -> MutableMapping[str, Any]:
         try:
-            return State(self.id)
+            return _get_project_state(self.id)
         except Exception as exc:
             logger.error('Failed to load `%r.state`: %r', self, exc)
         return {}
 
-    @property
-    def latest_session(
+    def get_latest_session(
         self, session_type: Literal['ephys', 'hab', 'behavior'] = 'ephys'
     ) -> int | None:
         """Lims session id for latest session for all child projects."""
+        try:
+            states = State.get_many(self.value)
+        except Exception as exc:
+            logger.error('Failed to load states for %r: %r', self, exc)
+            return None
         for _ in self.value:
-            session_id = Project(_).state.get(f'latest_{session_type}')
+            session_id = states.get(_, {}).get(f'latest_{session_type}')
             if session_id:
                 return session_id
         return None
 
+    @property
+    def latest_session(self) -> int | None:
+        """Lims session id for latest ephys session for all child projects."""
+        return self.get_latest_session('ephys')
+
     @latest_session.setter
     def latest_session(self, session_id: int) -> None:
         for _ in self.value:
             Project(_).state['latest_session'] = session_id
 
-    latest_ephys = functools.partialmethod(latest_session, 'ephys')
-    latest_hab = functools.partialmethod(latest_session, 'hab')
-    latest_behavior = functools.partialmethod(latest_session, 'behavior')
+    def latest_ephys(self) -> int | None:
+        return self.get_latest_session('ephys')
+
+    def latest_hab(self) -> int | None:
+        return self.get_latest_session('hab')
+
+    def latest_behavior(self) -> int | None:
+        return self.get_latest_session('behavior')
+
+
+_PROJECT_NAME_TO_PARENT: dict[str, Projects] = {}
+"""Lims project name -> first `Projects` member containing it, for `Project.parent`."""
+# per-member lookup structures are built once here, at import
+for _member in Projects:
+    _member._value_set = frozenset(_member.value)
+    for _name in _member.value:
+        _PROJECT_NAME_TO_PARENT.setdefault(_name, _member)
+del _member, _name
 
 
 class Project(WithState, InfoBaseClass):
+    __slots__ = ('_lims', '_state')
+
     def __init__(self, lims_project_name: str):
-        self.id = str(lims_project_name)
+        pass   # `id` is assigned in `InfoBaseClass.__new__`
 
-    @cached_property
+    @fast_cached_property
     def lims(self) -> LIMS2ProjectInfo:
         """Lims info for the project."""
-        return LIMS2ProjectInfo(self.id)
+        return _get_lims_project(self.id)
 
     def __eq__(self, other: Any) -> bool:
         if isinstance(other, Projects):
-            return self.id in other.value
+            return self.id in other._value_set
         return super().__eq__(other)
 
     @property
     def parent(self) -> Projects | None:
         """Parent project if it exists."""
-        for _ in Projects:
-            if self.id in _.value:
-                return _
-        return None
+        return _PROJECT_NAME_TO_PARENT.get(self.id)
 
 
 class Dye(WithState):
@@ -258,10 +365,13 @@ class Dye(WithState):
 
     def increment_uses(self):
         """Increment the number of times this dye has been used."""
-        previous_uses = self.previous_uses
-        if previous_uses == 0:
-            self.record_first_use()
-        self.previous_uses = self.previous_uses + 1
+        state = self.state
+        with state if isinstance(state, State) else contextlib.nullcontext(state):
+            previous_uses = state.setdefault('previous_uses', 0)
+            if previous_uses == 0:
+                # `self.state` is the same cached `State`: batched with the rest
+                self.record_first_use()
+            state['previous_uses'] = previous_uses + 1
 
 
 if __name__ == '__main__':
@@ -1,12 +1,22 @@
 from __future__ import annotations
+import concurrent.futures
 import contextlib
 
+import fnmatch
 import functools
+import itertools
+import logging
+import operator
+import os
 import pathlib
-from typing import Optional
+import re
+from typing import Optional, Sequence
 
 from typing_extensions import Literal
-from backports.cached_property import cached_property
+try:
+    from functools import cached_property
+except ImportError:  # Python < 3.8
+    from backports.cached_property import cached_property
 
 import np_config
 import np_logging
@@ -18,25 +28,87 @@ logger = np_logging.getLogger(__name__)
 
 SESSION_TYPES = ('D0', 'D1', 'D2', 'hab')
 
-@functools.lru_cache(maxsize=None)
+# for membership tests in `Manifest.parse_input_args`:
+_SESSION_TYPES_SET = frozenset(SESSION_TYPES)
+_PROJECTS_SET = frozenset(np_session.components.info.Projects.__members__)
+
+_MANIFESTS: Optional[dict[str, dict]] = None
+
+
 def get_manifests() -> dict[str, dict]:
-    return np_config.from_zk('projects/np_session/manifests')
+    """Manifest templates from ZK, fetched on first call."""
+    global _MANIFESTS
+    if _MANIFESTS is None:
+        _MANIFESTS = np_config.from_zk('projects/np_session/manifests')
+    return _MANIFESTS
+
+
+def __getattr__(name: str):
+    # `MANIFESTS` is fetched from ZK on first access, not on import
+    if name == 'MANIFESTS':
+        return get_manifests()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def _log_glob_hits(
+    path: pathlib.Path, pattern: str, hits: Sequence[pathlib.Path]
+) -> None:
+    """Debug-log globs that didn't match exactly one file, without building
+    the message when debug logging is off."""
+    if len(hits) == 1 or not logger.isEnabledFor(logging.DEBUG):
+        return
+    glob = path / pattern
+    if not hits:
+        logger.debug('No files found for glob: %s', glob)
+    else:
+        logger.debug(
+            'Multiple files found for glob: %s - %s - using first.', glob, hits
+        )
 
 
-class Manifest:
-    # class Config:
-    #     # validate_assignment = True # coerce types on assignment
-    #     # extra = 'allow' # 'forbid' = properties must be defined in the model
-    #     fields = {'names': {'exclude': True}, 'globs': {'exclude': True},  'types': {'exclude': True}}
-    #     arbitrary_types_allowed = True
+@functools.lru_cache(maxsize=64)
+def _resolve_manifest(
+    session_type: str, project: Optional[str]
+) -> tuple[tuple[str, ...], tuple[str, ...], tuple[str, ...]]:
+    """Names, globs and types for a session type + project manifest on ZK -
+    shared by all `Manifest` instances with the same pair."""
+    project = 'default' if project is None else project
+    manifests = get_manifests()
+    if project not in manifests[session_type]:
+        logger.debug(
+            'No manifest found for %s in %s manifests on ZK - using default.',
+            project,
+            session_type,
+        )
+    name_glob: dict[str, str] = manifests[session_type].get(
+        project, manifests[session_type]['default']
+    )
+    name_type: dict[str, str] = manifests['_name_type']
+    names = tuple(name_glob.keys())
+    return names, tuple(name_glob.values()), tuple(name_type[_] for _ in names)
+
 
-    session: Optional[np_session.session.Session] = None
+class Manifest:
+    __slots__ = (
+        'session',
+        'project',
+        'session_type',
+        'path',
+        'names',
+        'globs',
+        'types',
+        '_scanned_path',
+        '_scanned_names',
+        '__dict__',  # for cached properties
+    )
+
+    session: Optional[np_session.session.Session]
     """`np_session.Session` object"""
-    project: Optional[str] = None
+    project: Optional[str]
     """Umbrella project abbrv/acronym (DR, TTN, GLO)."""
-    session_type: Optional[Literal['D0', 'D1', 'D2', 'hab']] = None
+    session_type: Optional[Literal['D0', 'D1', 'D2', 'hab']]
     """Type of manifest for a specific session upload, e.g. `D1` for D1 upload."""
-    path: Optional[str | pathlib.Path] = None
+    path: Optional[str | pathlib.Path]
     """Session folder path, to be used with `globs`."""
 
     names: tuple[str, ...]
@@ -48,9 +120,16 @@ class Manifest:
 
     def __init__(self, *args, **kwargs) -> None:
 
-        self.__dict__.update(kwargs)
+        self.session = self.project = self.session_type = self.path = None
+        for name, value in kwargs.items():
+            setattr(self, name, value)
 
-        self.parse_input_args(*args, **kwargs)
+        if not (
+            isinstance(self.session, np_session.session.Session)
+            and self.session_type
+            and self.project
+        ):
+            self.parse_input_args(*args, **kwargs)
 
         if self.session:
             self.assign_props_from_session()
@@ -63,24 +142,32 @@ class Manifest:
     def remove_non_inserted_probes(self) -> None:
         if self.session is None:
             return
-        probes_inserted = self.session.probes_inserted
-        include_idx = tuple(
+        probe_tokens = frozenset(
+            f'probe_{letter.upper()}' for letter in self.session.probes_inserted
+        )
+        include_idx = tuple([
             i
             for i, name in enumerate(self.names)
             if (
                 'probe_' not in name  # not a probe field - skip
-                or any(
-                    f'probe_{letter.upper()}' in name
-                    for letter in probes_inserted
-                )
+                or any(_ in name for _ in probe_tokens)
             )
-        )
+        ])
+        if len(include_idx) == len(self.names):
+            return
+        if len(include_idx) < 2:
+            # itemgetter returns a bare item for a single index
+            self.names, self.globs, self.types = (
+                tuple(_[i] for i in include_idx)
+                for _ in (self.names, self.globs, self.types)
+            )
+            return
+        pick = operator.itemgetter(*include_idx)
         self.names, self.globs, self.types = (
-            tuple(_[i] for i in include_idx)
-            for _ in (self.names, self.globs, self.types)
+            pick(self.names), pick(self.globs), pick(self.types)
         )
 
-    @property
+    @cached_property
     def files(self) -> dict[str, dict[str, str]]:
         """Upload manifest for platform json: `{name: {type: session + glob}}, ...}`"""
         if not self.session:
@@ -111,76 +198,127 @@ class Manifest:
                 f'Must provide either `path` or `session` as {self.__class__} property to return paths.'
             )
         paths = []
-        for _ in self.globs:
-            hits = tuple(path.glob(_))
-            if len(hits) == 0:
-                logger.debug(f'No files found for glob: {path / _}')
-            if len(hits) > 1:
-                logger.debug(
-                    f'Multiple files found for glob: {path / _} - {hits} - using first.'
-                )
-
+        for _, hits in zip(self.globs, self._glob_all(path, self.globs)):
+            _log_glob_hits(path, _, hits)
             paths.append(hits[0] if hits else None)
 
         return tuple(paths)
 
+    def _scan(self, path: pathlib.Path) -> tuple[str, ...]:
+        """Names of everything in `path`, scanned once and shared by `paths` and
+        `get_sorted_data`."""
+        with contextlib.suppress(AttributeError):
+            if self._scanned_path == path:
+                return self._scanned_names
+        try:
+            with os.scandir(path) as entries:
+                names = tuple(entry.name for entry in entries)
+        except OSError:
+            names = ()
+        self._scanned_path, self._scanned_names = path, names
+        return names
+
+    def _glob_all(
+        self, path: pathlib.Path, patterns: Sequence[str]
+    ) -> tuple[tuple[pathlib.Path, ...], ...]:
+        """Equivalent to `tuple(path.glob(_)) for _ in patterns`, but single-level
+        patterns are matched against a cached directory listing, with one
+        compiled regex rejecting non-matching entries in a single pass.
+        Multi-level patterns are globbed concurrently."""
+        single_level = {
+            i: re.compile(fnmatch.translate(os.path.normcase(pattern)))
+            for i, pattern in enumerate(patterns)
+            if not any(_ in pattern for _ in ('/', '\\', '**'))
+        }
+        hits: dict[int, list[pathlib.Path]] = {i: [] for i in single_level}
+        if single_level:
+            any_pattern = re.compile(
+                '|'.join(_.pattern for _ in single_level.values())
+            )
+            for name in self._scan(path):
+                normcase_name = os.path.normcase(name)
+                if not any_pattern.match(normcase_name):
+                    continue
+                # an entry can match more than one pattern
+                for i, pattern in single_level.items():
+                    if pattern.match(normcase_name):
+                        hits[i].append(path / name)
+        multi_level = [i for i in range(len(patterns)) if i not in hits]
+        if multi_level:
+            # each of these needs its own walk of the filesystem: overlap the
+            # network latency
+            with concurrent.futures.ThreadPoolExecutor(
+                min(16, len(multi_level))
+            ) as executor:
+                hits.update(
+                    zip(
+                        multi_level,
+                        executor.map(
+                            lambda i: list(path.glob(patterns[i])), multi_level
+                        ),
+                    )
+                )
+        return tuple(tuple(hits[i]) for i in range(len(patterns)))
+
     @property
     def missing(self) -> tuple[str, ...]:
         return tuple(n for n, p in zip(self.names, self.paths) if p is None)
 
-    def get_sorted_data(self) -> None:
-        self._names_sorted_data = []
-        self._paths_sorted_data = []
-        self._globs_sorted_data = []
-        for probe in (
+    def get_sorted_data(
+        self,
+    ) -> tuple[
+        tuple[str, ...], tuple[pathlib.Path | None, ...], tuple[str, ...]
+    ]:
+        """Names, paths and globs for sorted data from each inserted probe."""
+        names: list[str] = []
+        paths: list[pathlib.Path | None] = []
+        globs: list[str] = []
+        probes = (
             'ABCDEF' if self.session is None else self.session.probes_inserted
-        ):
-            for name, glob in get_manifests()['_name_glob']['sorted_data'].items():
-                probe_glob = f'*_probe{probe}{glob}'
-                self._globs_sorted_data.append(probe_glob)
-                self._names_sorted_data.append(f'{name}_probe{probe}')
+        )
+        name_glob = tuple(get_manifests()['_name_glob']['sorted_data'].items())
+        for probe in probes:
+            for name, glob in name_glob:
+                globs.append(f'*_probe{probe}{glob}')
+                names.append(f'{name}_probe{probe}')
                 if self.session is None:
                     logger.warning(
-                        f'No session provided to {self.__class__} - cannot get sorted data paths.'
-                    )
-                    return
-                hits = tuple(self.session.npexp_path.glob(probe_glob))
-                if len(hits) == 0:
-                    logger.debug(
-                        f'No files found for glob: {self.session.npexp_path / probe_glob}'
+                        'No session provided to %s - cannot get sorted data paths.',
+                        self.__class__,
                     )
-                if len(hits) > 1:
-                    logger.debug(
-                        f'Multiple files found for glob: {self.session.npexp_path / probe_glob} - {hits} - using first.'
-                    )
-                self._paths_sorted_data.append(hits[0] if hits else None)
+                    return tuple(names), tuple(paths), tuple(globs)
+        path = self.session.npexp_path
+        for probe_glob, hits in zip(globs, self._glob_all(path, globs)):
+            _log_glob_hits(path, probe_glob, hits)
+            paths.append(hits[0] if hits else None)
+        return tuple(names), tuple(paths), tuple(globs)
 
-    @property
+    @cached_property
+    def _sorted_data(
+        self,
+    ) -> tuple[
+        tuple[str, ...], tuple[pathlib.Path | None, ...], tuple[str, ...]
+    ]:
+        return self.get_sorted_data()
+
+    @cached_property
     def names_sorted_data(self) -> tuple[str, ...]:
-        with contextlib.suppress(AttributeError):
-            return tuple(self._names_sorted_data)
-        self.get_sorted_data()
-        return self.names_sorted_data
+        return self._sorted_data[0]
 
-    @property
+    @cached_property
     def paths_sorted_data(self) -> tuple[pathlib.Path | None, ...]:
-        with contextlib.suppress(AttributeError):
-            return tuple(self._paths_sorted_data)
-        self.get_sorted_data()
-        return self.paths_sorted_data
+        return self._sorted_data[1]
 
-    @property
+    @cached_property
     def globs_sorted_data(self) -> tuple[str, ...]:
-        with contextlib.suppress(AttributeError):
-            return tuple(self._globs_sorted_data)
-        self.get_sorted_data()
-        return self.globs_sorted_data
+        return self._sorted_data[2]
 
     @property
     def missing_sorted_data(self) -> tuple[str]:
         if self.session is None:
             logger.warning(
-                f'No session provided to {self.__class__} - cannot get sorted data paths.'
+                'No session provided to %s - cannot get sorted data paths.',
+                self.__class__,
             )
             return tuple()
         return tuple(
@@ -190,58 +328,53 @@ class Manifest:
         )
 
     def parse_input_args(self, *args, **kwargs) -> None:
-        for _ in (*args, *kwargs.values()):
-            if isinstance(_, np_session.session.Session):
-                self.session = _
-                break
-            elif isinstance(_, int):
-                self.session = np_session.session.Session(_)
-                break
-            elif isinstance(_, str):
-                with contextlib.suppress(ValueError):
+        # only fill in what wasn't already assigned from kwargs
+        find_session = not isinstance(self.session, np_session.session.Session)
+        find_session_type = self.session_type is None
+        find_project = self.project is None
+        for _ in itertools.chain(args, kwargs.values()):
+            if find_session:
+                if isinstance(_, np_session.session.Session):
+                    self.session = _
+                    find_session = False
+                elif isinstance(_, int):
                     self.session = np_session.session.Session(_)
-                    break
-
-        for _ in SESSION_TYPES:
-            if _ in (*args, *kwargs.values()):
-                self.session_type = _
-                break
-
-        for _ in (*args, *kwargs.values()):
-            if _ in np_session.components.info.Projects.__members__:
-                self.project = _
+                    find_session = False
+                elif isinstance(_, str):
+                    with contextlib.suppress(ValueError):
+                        self.session = np_session.session.Session(_)
+                        find_session = False
+            if isinstance(_, str):
+                if find_session_type and _ in _SESSION_TYPES_SET:
+                    self.session_type = _
+                    find_session_type = False
+                if find_project and _ in _PROJECTS_SET:
+                    self.project = _
+                    find_project = False
+            if not (find_session or find_session_type or find_project):
                 break
 
     def assign_props_from_session(self) -> None:
         if self.project is None:
             self.project = self.session.project.parent.name
             logger.debug(
-                f'No project provided, using {self.project} for {self.session}'
+                'No project provided, using %s for %s',
+                self.project,
+                self.session,
             )
         if self.session_type is None:
             self.session_type = 'hab' if self.session.is_hab else 'D1'
             logger.debug(
-                f'No session_type provided, using {self.session_type} for {self.session}'
+                'No session_type provided, using %s for %s',
+                self.session_type,
+                self.session,
             )
 
     def fetch_from_zk(self) -> None:
         """Fetch names, file globs and file/dir types from zookeeper."""
-        project = 'default' if self.project is None else self.project
-        default = get_manifests()[self.session_type]['default']
-        if project not in get_manifests()[self.session_type]:
-            logger.debug(
-                f'No manifest found for {project} in {self.session_type} manifests on ZK - using default.'
-            )
-        name_glob: dict[str, str] = get_manifests()[self.session_type].get(
-            project, default
+        self.names, self.globs, self.types = _resolve_manifest(
+            self.session_type, self.project
         )
 
-        self.names, self.globs = tuple(name_glob.keys()), tuple(
-            name_glob.values()
-        )
-
-        name_type: dict[str, str] = get_manifests()['_name_type']
-        self.types = tuple(name_type[_] for _ in self.names)
-
     def __repr__(self) -> str:
         return repr(self.files)
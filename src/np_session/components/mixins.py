@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import contextlib
+from typing import Any, Callable, Generic, TypeVar
 
 import np_logging
 from typing_extensions import Protocol, runtime_checkable
@@ -8,20 +10,68 @@ from np_session.databases import State
 
 logger = np_logging.getLogger(__name__)
 
+T = TypeVar('T')
+
+
+class fast_cached_property(Generic[T]):
+    """Lock-free alternative to `cached_property`, which also works on classes
+    with `__slots__`: the value is stored in the instance attribute
+    `_<name>` on first access - a slot, if the class has no `__dict__`.
+
+    Not thread-safe: concurrent first accesses may each compute the value.
+    """
+
+    def __init__(self, func: Callable[[Any], T]) -> None:
+        self.func = func
+        self.__set_name__(None, func.__name__)
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner: type | None, name: str) -> None:
+        self.name = name
+        self.attr = f'_{name}'
+
+    def __get__(self, obj: Any, cls: type | None = None) -> T:
+        if obj is None:
+            return self
+        try:
+            return getattr(obj, self.attr)
+        except AttributeError:
+            pass
+        value = self.func(obj)
+        setattr(obj, self.attr, value)
+        return value
+
 
 @runtime_checkable
 class WithState(Protocol):
     """Protocol for types that have a `state` attribute for persisting
     metadata. Can also be used as a mixin to provide basic state implementation.
+
+    Mixin subclasses with `__slots__` need a `_state` slot for the cached
+    `State`.
     """
 
+    __slots__ = ()
+
     id: int | str
     """Unique identifier for the object. This is used as the key for the object's state in the database."""
 
     @property
     def state(self) -> State:
         try:
-            return State(self.id)
+            return self._state
+        except AttributeError:
+            pass
+        try:
+            state = State(self.id)
         except Exception as exc:
             logger.error('Failed to load `%r.state`: %r', self, exc)
-        return {}
+            # not cached, so the next access retries
+            return {}
+        self._state = state
+        return state
+
+    def invalidate_state(self) -> None:
+        """Drop the cached `state`, so the next access reconnects."""
+        with contextlib.suppress(AttributeError):
+            del self._state
@@ -1,3 +1,6 @@
+from __future__ import annotations
+
+import functools
 import pathlib
 
 import np_config
@@ -38,3 +41,9 @@ QC_PATHS = (
     ),
 )
 'Item 0 is used as default - currently new np-exp/qc folder.'
+
+
+@functools.lru_cache(maxsize=1)
+def existing_qc_roots() -> tuple[pathlib.Path, ...]:
+    """Items in `QC_PATHS` that exist, checked once per process."""
+    return tuple(path for path in QC_PATHS if path.exists())
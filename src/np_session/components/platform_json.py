@@ -3,21 +3,74 @@ from __future__ import annotations
 import contextlib
 import copy
 import datetime
+import functools
 import json
+import logging
+import os
 import pathlib
 import re
 import typing
 import time
-from typing import Any, ClassVar, Dict, Generator, List, Optional, Union
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    FrozenSet,
+    Generator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import np_config
 import np_logging
 import pydantic
 from pydantic_core import CoreSchema, core_schema
 from typing_extensions import Annotated
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # optional: faster parsing of large platform jsons
+    from json import loads as json_loads
+
 logger = np_logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1024)
+def _normalize_path(path: Union[str, pathlib.Path]) -> pathlib.Path:
+    return np_config.normalize_path(path)
+
+
+@functools.lru_cache(maxsize=1024)
+def _normalize_time(v: Any) -> str:
+    return np_config.normalize_time(v)
+
+
+def _now() -> str:
+    # whole seconds (all that's kept anyway) so repeat calls hit the cache
+    return _normalize_time(int(time.time()))
+
+
+@functools.lru_cache(maxsize=1)
+def _get_rig_id() -> Optional[str]:
+    """ID of the rig this computer belongs to, if any - looked up once, on first use."""
+    return np_config.Rig().id if np_config.get_rig_idx() else None
+
+
+def _merged(existing: dict, new: dict) -> dict:
+    """Recursively merge `new` into a copy of `existing`, without modifying
+    either: only dicts along merged paths are copied, not the whole tree."""
+    merged = dict(existing)
+    for k, v in new.items():
+        if isinstance(v, dict) and isinstance(merged.get(k), dict):
+            merged[k] = _merged(merged[k], v)
+        else:
+            merged[k] = v
+    return merged
+
+
 class PlatformJsonDateTime(datetime.datetime):
 
     @classmethod
@@ -26,19 +79,34 @@ class PlatformJsonDateTime(datetime.datetime):
             return None
         if not isinstance(v, str) and len(v) != 14:
             raise TypeError('14-digit string required')
-        return cls(*cls.str2components(np_config.normalize_time(v)))
+        if isinstance(v, str):
+            return cls(*_str2components(v))
+        return cls(*cls.str2components(_normalize_time(v)))
 
     @staticmethod
-    def str2components(v: str) -> tuple[int, int, int, int, int, int, int]:
-        return (int(v[:4]), *(int(v[_ : _ + 2]) for _ in range(4, 14, 2)))
+    def str2components(v: str) -> tuple[int, int, int, int, int, int]:
+        return (
+            int(v[:4]),
+            int(v[4:6]),
+            int(v[6:8]),
+            int(v[8:10]),
+            int(v[10:12]),
+            int(v[12:14]),
+        )
 
     def __str__(self):
-        return np_config.normalize_time(self)
+        return _normalize_time(self)
 
     def isoformat(self, *args, **kwargs) -> str:
         return str(self)
 
 
+@functools.lru_cache(maxsize=256)
+def _str2components(v: str) -> tuple[int, int, int, int, int, int]:
+    """Normalized and parsed once per distinct time string."""
+    return PlatformJsonDateTime.str2components(_normalize_time(v))
+
+
 class _PlatformJsonDateTimeAnnotation:
 
     @classmethod
@@ -101,6 +169,24 @@ PydanticPlatformJsonDateTime = Annotated[
 ]
 
 
+class _SyncDisabled:
+    """Re-entrant context manager that turns off `file_sync` on a
+    `PlatformJson` - one is reused for every `with pj.sync_disabled():`."""
+
+    __slots__ = ('_platform_json', '_previous')
+
+    def __init__(self, platform_json: PlatformJson) -> None:
+        self._platform_json = platform_json
+        self._previous: List[bool] = []
+
+    def __enter__(self) -> None:
+        self._previous.append(self._platform_json.file_sync)
+        self._platform_json.file_sync = False
+
+    def __exit__(self, *exc_info) -> None:
+        self._platform_json.file_sync = self._previous.pop()
+
+
 class PlatformJson(pydantic.BaseModel):
     """Writes D1 platform json for lims upload. Just requires a path (dir or dir+filename)."""
 
@@ -119,12 +205,49 @@ class PlatformJson(pydantic.BaseModel):
         exclude=True,
     )
 
+    _EXCLUDED: ClassVar[FrozenSet[str]] = frozenset()
+    'Fields with `exclude=True`: set directly, without syncing to file.'
+
+    _existing_dirs: ClassVar[Set[pathlib.Path]] = set()
+    'Parent dirs already created on write, by any instance.'
+
+    _UNVALIDATED_TYPES: ClassVar[Dict[str, Tuple[type, ...]]] = {}
+    'Scalar fields without validators -> value types assigned without validation.'
+
+    _disk_cache: Optional[Tuple[int, int, Dict[str, Any]]] = pydantic.PrivateAttr(
+        default=None
+    )
+    'File `(st_mtime_ns, st_size, contents)` from the last read or write.'
+
+    _last_written: Optional[Dict[str, Any]] = pydantic.PrivateAttr(default=None)
+    'Fields from the last write, excluding `platform_json_save_time`.'
+
+    _sync_disabled: Optional[_SyncDisabled] = pydantic.PrivateAttr(default=None)
+
+    def sync_disabled(self) -> _SyncDisabled:
+        """Context manager to temporarily disable writing to file when a property is updated.
+
+        Can be nested: the previous setting is restored on exit.
+        """
+        # a copy of this model inherits the private attribute: don't reuse one
+        # that targets another instance
+        if (
+            self._sync_disabled is None
+            or self._sync_disabled._platform_json is not self
+        ):
+            self._sync_disabled = _SyncDisabled(self)
+        return self._sync_disabled
+
     @contextlib.contextmanager
-    def sync_disabled(self) -> Generator[None, None, None]:
-        """Context manager to temporarily disable writing to file when a property is updated."""
-        self.file_sync = False
-        yield
-        self.file_sync = True   
+    def batched(self) -> Generator[None, None, None]:
+        """Context manager to group updates: fields are loaded from file once on
+        entry, and written once on exit (if anything changed)."""
+        if self.file_sync:
+            self.load_from_existing()
+        with self.sync_disabled():
+            yield
+        if self.file_sync:   # not nested in another batch
+            self.write()
 
     model_config = pydantic.ConfigDict(
         validate_assignment=True,
@@ -141,9 +264,7 @@ class PlatformJson(pydantic.BaseModel):
             logger.debug('Loading from existing %s', self.path.name)
         else:
             logger.debug('Creating new %s', self.path.name)
-            self.platform_json_creation_time = np_config.normalize_time(
-                time.time()
-            )
+            self.platform_json_creation_time = _now()
         self.load_from_existing()
 
     def __str__(self):
@@ -152,25 +273,65 @@ class PlatformJson(pydantic.BaseModel):
     def load_from_existing(self) -> None:
         """Update empty fields with non-empty fields from file."""
         with self.sync_disabled():
-            if not self.path.exists():
-                return
-            contents = json.loads(self.path.read_text() or '{}')
+            contents = self.read_contents()
             for k, v in contents.items():
                 if not v:
                     continue
-                if isinstance(v, (dict, list)) and not all(_ for _ in v):
+                if isinstance(v, dict) and not any(v.values()):
+                    continue
+                if isinstance(v, list) and not any(v):
+                    continue
+                current = getattr(self, k, None)
+                if current == v or (
+                    # stored as str in file
+                    isinstance(current, PlatformJsonDateTime)
+                    and str(current) == v
+                ):
                     continue
                 setattr(self, k, v)
 
+    def read_contents(self) -> Dict[str, Any]:
+        """Parsed contents of file - only re-read if the file has changed since
+        the last read or write."""
+        key = self._stat_key()
+        if key is None:
+            return {}
+        if self._is_file_unchanged(key):
+            contents = self._disk_cache[2]
+        else:
+            contents = json_loads(self.path.read_bytes() or b'{}')
+            self._disk_cache = (*key, contents)
+        # a copy: the cached contents share objects with `_last_written`, which
+        # decides whether the next write can be skipped
+        return copy.deepcopy(contents)
+
+    def _stat_key(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _is_file_unchanged(self, key: Optional[Tuple[int, int]] = None) -> bool:
+        """Whether the file is as it was at the last read or write."""
+        if key is None:
+            key = self._stat_key()
+        return (
+            key is not None
+            and self._disk_cache is not None
+            and self._disk_cache[:2] == key
+        )
+
     def __setattr__(self, name, value):
 
+        if name in self.__private_attributes__:
+            return super().__setattr__(name, value)
+
         # if field is in non-validated list, just set it
-        if name in (
-            k for k, v in self.model_fields.items() if v.exclude
-        ):
+        if name in self._EXCLUDED:
             return super().__setattr__(name, value)
 
-        if self.file_sync:
+        if self.file_sync and not self._is_file_unchanged():
             # fetch fields from disk before writing, in case another process updated the
             # file since we last read it
             self.load_from_existing()
@@ -178,9 +339,16 @@ class PlatformJson(pydantic.BaseModel):
         if getattr(self, name, None) == value:
             return
 
-        _ = super().__setattr__(name, value)
+        if type(value) in self._UNVALIDATED_TYPES.get(name, ()):
+            # nothing to coerce or check: skip pydantic's validation
+            self.__dict__[name] = value
+            self.__pydantic_fields_set__.add(name)
+            _ = None
+        else:
+            _ = super().__setattr__(name, value)
 
-        logger.debug('Updated %s.%s = %s', self.path.name, name, value)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Updated %s.%s = %s', self.path.name, name, value)
 
         if self.file_sync:
             self.write()
@@ -188,20 +356,51 @@ class PlatformJson(pydantic.BaseModel):
         return _
 
     def write(self):
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        self.path.touch()
-        with self.sync_disabled():
-            self.platform_json_save_time = np_config.normalize_time(
-                time.time()
+        payload = self.model_dump(mode='json')
+        fields = {
+            k: v for k, v in payload.items() if k != 'platform_json_save_time'
+        }
+        if fields == self._last_written and self._is_file_unchanged():
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    '%s unchanged since last write to %s: skipped',
+                    self.__class__.__name__,
+                    self.path.as_posix(),
+                )
+            return
+        if self.path.parent not in self._existing_dirs:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._existing_dirs.add(self.path.parent)
+        # stamp the output directly: a validated assignment isn't needed for a
+        # value we generate
+        save_time = _now()
+        payload['platform_json_save_time'] = save_time
+        self.__dict__['platform_json_save_time'] = save_time
+        text = json.dumps(payload, indent=4, ensure_ascii=False)
+        # write to a temp file then swap it in, so readers never see a partial file
+        tmp = self.path.with_suffix('.json.tmp')
+        try:
+            tmp.write_text(text, encoding='utf-8')
+            try:
+                os.replace(tmp, self.path)
+            except PermissionError:
+                # on Windows, replacing fails while another process has the
+                # file open: write it in place instead
+                self.path.write_text(text, encoding='utf-8')
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                tmp.unlink()
+        stat = self.path.stat()
+        self._disk_cache = (stat.st_mtime_ns, stat.st_size, payload)
+        self._last_written = fields
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                '%s wrote to %s', self.__class__.__name__, self.path.as_posix()
             )
-        self.path.write_text(self.model_dump_json(indent=4))
-        logger.debug(
-            '%s wrote to %s', self.__class__.__name__, self.path.as_posix()
-        )
 
     @pydantic.field_validator('path', mode="before")
     def normalize_path(cls, v: Union[str, pathlib.Path]) -> pathlib.Path:
-        return np_config.normalize_path(v)
+        return _normalize_path(v)
 
     @pydantic.field_validator('path', mode="after")
     def add_filename_to_path(cls, v: pathlib.Path) -> pathlib.Path:
@@ -209,23 +408,24 @@ class PlatformJson(pydantic.BaseModel):
         return v / name if v.is_dir() else v.with_name(name)
 
     @classmethod
+    @functools.lru_cache(maxsize=1024)
     def append_suffix_to_filename(cls, v: str) -> str:
         v = v.split('.json')[0].split('platform')[0].rstrip('_')
         v += cls.suffix
         return v
 
-    _foraging_id_re: ClassVar[str] = (
-        r'([0-9,a-f]{8}-[0-9,a-f]{4}-[0-9,a-f]{4}-[0-9,a-f]{4}-[0-9,a-f]{12})'
-        r'|([0-9,a-f]{8})'
+    _foraging_id_re: ClassVar[re.Pattern] = re.compile(
+        r'([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})'
+        r'|([0-9a-f]{8})'
     )
 
     # auto-generated / ignored ------------------------------------------------------------- #
     platform_json_save_time: Union[PydanticPlatformJsonDateTime, str] = ''
     'Updated on write.'
-    rig_id: Optional[str] = np_config.Rig().id if np_config.get_rig_idx() else None
+    rig_id: Optional[str] = pydantic.Field(default_factory=lambda: _get_rig_id())
     wfl_version: float = 0
     platform_json_creation_time: PydanticPlatformJsonDateTime = pydantic.Field(
-        default_factory=lambda: np_config.normalize_time(time.time()),
+        default_factory=_now,
     )
 
     # pre-experiment
@@ -273,19 +473,30 @@ class PlatformJson(pydantic.BaseModel):
     ExperimentNotes: Dict[str, Dict[str, Any]] = dict(
         BleedingOnInsertion={}, BleedingOnRemoval={}
     )
-    foraging_id: str = pydantic.Field(default='', pattern=_foraging_id_re)
+    foraging_id: str = ''
     foraging_id_list: List[str] = pydantic.Field(
         default_factory=lambda: [''],
     )
+
+    @pydantic.field_validator('foraging_id')
+    @classmethod
+    def foraging_id_matches_pattern(cls, v: str) -> str:
+        if cls._foraging_id_re.search(v) is None:
+            raise ValueError(
+                'Id failed pattern check. id=%s, pattern=%s'
+                % (v, cls._foraging_id_re.pattern)
+            )
+        return v
+
     # @pydantic.field_validator('foraging_id_list')
     # @classmethod
     # def ids_in_foraging_id_list_match_pattern(
     #         cls, v: List[str]) -> List[str]:
     #     for foraging_id in v:
-    #         if re.match(cls._foraging_id_re, foraging_id) is None:
+    #         if cls._foraging_id_re.match(foraging_id) is None:
     #             raise ValueError(
     #                 'Id failed pattern check. id=%s, pattern=%s' % 
-    #                 (foraging_id, cls._foraging_id_re, )
+    #                 (foraging_id, cls._foraging_id_re.pattern, )
     #             )
     #     return v
 
@@ -302,8 +513,10 @@ class PlatformJson(pydantic.BaseModel):
     files: Dict[str, Dict[str, str]] = pydantic.Field(default_factory=dict)
 
     def update(self, field, new) -> None:
-
-        self.load_from_existing()
+        """Merge `new` into `field` and write to file - unless file sync is
+        disabled, in which case the caller is responsible for writing."""
+        if self.file_sync:
+            self.load_from_existing()
 
         existing = getattr(self, field)
 
@@ -311,22 +524,68 @@ class PlatformJson(pydantic.BaseModel):
             return
 
         # now merge the new value with the existing value in the file if it's a dict
-        with contextlib.suppress(TypeError, AttributeError):
-            new = np_config.merge(copy.deepcopy(getattr(self, field)), new)
+        if isinstance(existing, dict) and isinstance(new, dict):
+            new = _merged(existing, new)
 
         logger.debug(
             'Updating %s %s: %s -> %s', self.path.name, field, existing, new
         )
         with self.sync_disabled():
             setattr(self, field, new)
-        self.write()
+        if self.file_sync:
+            self.write()
+
+
+PlatformJson._EXCLUDED = frozenset(
+    name for name, field in PlatformJson.model_fields.items() if field.exclude
+)
+
+_validated_fields = frozenset(
+    name
+    for validator in PlatformJson.__pydantic_decorators__.field_validators.values()
+    for name in validator.info.fields
+)
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def _scalar_types(annotation: Any) -> Tuple[type, ...]:
+    """Types accepted unchanged by a scalar or union-of-scalars annotation."""
+    if annotation in _SCALAR_TYPES:
+        return (annotation,)
+    if typing.get_origin(annotation) is Union:
+        args = typing.get_args(annotation)
+        if all(_ in _SCALAR_TYPES for _ in args):
+            return args
+    return ()
+
+
+def _has_datetime(annotation: Any) -> bool:
+    return annotation is PlatformJsonDateTime or any(
+        _has_datetime(_) for _ in typing.get_args(annotation)
+    )
+
+
+def _unvalidated_types(field: pydantic.fields.FieldInfo) -> Tuple[type, ...]:
+    if _has_datetime(field.annotation):
+        # already-parsed instances pass validation unchanged - strs don't
+        return (PlatformJsonDateTime,)
+    if field.metadata:
+        return ()
+    return _scalar_types(field.annotation)
+
+
+PlatformJson._UNVALIDATED_TYPES = {
+    name: _unvalidated_types(field)
+    for name, field in PlatformJson.model_fields.items()
+    if name not in _validated_fields and _unvalidated_types(field)
+}
 
 
 def update_from_session(pj: PlatformJson, session) -> None:
     """Updates fields in a platform json file."""
     #! careful not to execute Session methods that call this platform json instance in a loop
 
-    with pj.sync_disabled():
+    with pj.batched():
         logger.debug(
             'Updating %s with session %s fields, with write disabled',
             pj.path.name,
@@ -350,5 +609,3 @@ def update_from_session(pj: PlatformJson, session) -> None:
         pj.update('foraging_id', session.foraging_id)
         pj.update('project', session.project.id)
         pj.update('hab', session.is_hab)
-
-    pj.write()
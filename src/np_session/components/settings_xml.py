@@ -25,14 +25,49 @@ import datetime
 import doctest
 import functools
 import hashlib
+import operator
 import pathlib
-import xml.etree.ElementTree as ET
+import re
+
+try:
+    from lxml import etree as ET
+except ImportError:  # optional: faster parsing and tree iteration
+    import xml.etree.ElementTree as ET
+
+
+_DATE_TIME_RE = re.compile(
+    r'(\d{1,2}) ([A-Za-z]{3}) (\d{4}) (\d{1,2}):(\d{2}):(\d{2})$'
+)
+_MONTHS = {
+    month: idx
+    for idx, month in enumerate(
+        (
+            'jan', 'feb', 'mar', 'apr', 'may', 'jun',
+            'jul', 'aug', 'sep', 'oct', 'nov', 'dec',
+        ),
+        start=1,
+    )
+}
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True)
 class SettingsXmlInfo:
     """Info from a settings.xml file from an Open Ephys recording."""
 
+    # `dataclass(slots=True)` needs py>=3.10 - fine to declare by hand, as no
+    # fields have defaults
+    __slots__ = (
+        'path',
+        'probe_serial_numbers',
+        'probe_types',
+        'probe_letters',
+        'hostname',
+        'date',
+        'start_time',
+        'open_ephys_version',
+        'settings_xml_md5',
+    )
+
     path: pathlib.Path
     probe_serial_numbers: tuple[int, ...]
     probe_types: tuple[str, ...]
@@ -47,42 +82,83 @@ class SettingsXmlInfo:
 def settings_xml_info_from_path(path: str | pathlib.Path) -> SettingsXmlInfo:
     """Info from a settings.xml file from an Open Ephys recording."""
     path = pathlib.Path(path)
-    et = ET.parse(path)
+    et = _parse(path.as_posix(), path.stat().st_mtime_ns)
+    date, start_time = date_time(et)
     return SettingsXmlInfo(
         path=path,
         probe_serial_numbers=probe_serial_numbers(et),
         probe_types=probe_types(et),
         probe_letters=probe_letters(et),
         hostname=hostname(et),
-        date=date_time(et)[0],
-        start_time=date_time(et)[1],
+        date=date,
+        start_time=start_time,
         open_ephys_version=open_ephys_version(et),
         settings_xml_md5=settings_xml_md5(path),
     )
 
 
-def get_tag_text(et: ET.ElementTree, tag: str) -> str | None:
-    result = [
-        element.text
+_TREE_CACHE_SIZE = 256
+"""Parsed trees kept by `_parse`: caches keyed on a tree get the same bound, so
+they don't keep evicted trees alive."""
+
+
+@functools.lru_cache(maxsize=_TREE_CACHE_SIZE)
+def _parse(path: str, mtime_ns: int) -> ET.ElementTree:
+    """Parsed once per path, until the file is modified."""
+    return ET.parse(path)
+
+
+@functools.lru_cache(maxsize=_TREE_CACHE_SIZE)
+def _elements(et: ET.ElementTree) -> tuple[ET.Element, ...]:
+    """All elements in document order, from a single walk of the tree."""
+    return tuple(
+        # lxml also yields comments and processing instructions: skip them
+        element
         for element in et.getroot().iter()
-        if element.tag == tag.upper()
-    ]
-    if not (result and any(result)):
-        result = [
-            element.attrib.get(tag.lower()) for element in et.getroot().iter()
-        ]
-    return str(result[0]) if (result and any(result)) else None
+        if isinstance(element.tag, str)
+    )
+
+
+@functools.lru_cache(maxsize=_TREE_CACHE_SIZE)
+def _elements_by_tag(et: ET.ElementTree) -> dict[str, tuple[ET.Element, ...]]:
+    by_tag: dict[str, list[ET.Element]] = {}
+    for element in _elements(et):
+        by_tag.setdefault(element.tag, []).append(element)
+    return {tag: tuple(elements) for tag, elements in by_tag.items()}
+
+
+def get_tag_text(et: ET.ElementTree, tag: str) -> str | None:
+    result = next(
+        (
+            element.text
+            for element in _elements_by_tag(et).get(tag.upper(), ())
+            if element.text
+        ),
+        None,
+    ) or next(
+        (
+            element.attrib[tag.lower()]
+            for element in _elements(et)
+            if element.attrib.get(tag.lower())
+        ),
+        None,
+    )
+    return None if result is None else str(result)
 
 
 def get_tag_attrib(et: ET.ElementTree, tag: str, attrib: str) -> str | None:
-    result = [
-        element.attrib.get(attrib)
-        for element in et.getroot().iter()
-        if element.tag == tag.upper()
-    ]
-    return str(result[0]) if (result and any(result)) else None
+    result = next(
+        (
+            element.attrib[attrib]
+            for element in _elements_by_tag(et).get(tag.upper(), ())
+            if element.attrib.get(attrib)
+        ),
+        None,
+    )
+    return None if result is None else str(result)
 
 
+@functools.lru_cache(maxsize=_TREE_CACHE_SIZE)
 def hostname(et: ET.ElementTree) -> str:
     result = (
         # older, pre-0.6.x:
@@ -95,31 +171,37 @@ def hostname(et: ET.ElementTree) -> str:
     return result
 
 
-@functools.lru_cache(maxsize=None)
+@functools.lru_cache(maxsize=_TREE_CACHE_SIZE)
 def date_time(et: ET.ElementTree) -> tuple[datetime.date, datetime.time]:
     """Date and recording start time."""
     result = get_tag_text(et, 'date')
     if not result:
         raise LookupError(f'No datetime found: {result!r}')
+    match = _DATE_TIME_RE.match(result)
+    if match and match[2].lower() in _MONTHS:
+        day, month, year, hour, minute, second = match.groups()
+        date = datetime.date(int(year), _MONTHS[month.lower()], int(day))
+        time = datetime.time(int(hour), int(minute), int(second))
+        return date, time
     dt = datetime.datetime.strptime(result, '%d %b %Y %H:%M:%S')
     return dt.date(), dt.time()
 
 
-@functools.lru_cache(maxsize=None)
+@functools.lru_cache(maxsize=_TREE_CACHE_SIZE)
 def probe_attrib_dicts(et: ET.ElementTree) -> tuple[dict[str, str], ...]:
     return tuple(
         probe_dict.attrib
-        for probe_dict in et.getroot().iter()
+        for probe_dict in _elements(et)
         if 'probe_serial_number' in probe_dict.attrib
     )
 
 
 def probe_attrib(et: ET.ElementTree, attrib: str) -> tuple[str, ...]:
-    return tuple(probe[attrib] for probe in probe_attrib_dicts(et))
+    return tuple(map(operator.itemgetter(attrib), probe_attrib_dicts(et)))
 
 
 def probe_serial_numbers(et: ET.ElementTree) -> tuple[int, ...]:
-    return tuple(int(_) for _ in probe_attrib(et, 'probe_serial_number'))
+    return tuple(map(int, probe_attrib(et, 'probe_serial_number')))
 
 
 def probe_types(et: ET.ElementTree) -> tuple[str, ...]:
@@ -129,15 +211,18 @@ def probe_types(et: ET.ElementTree) -> tuple[str, ...]:
         return tuple('unknown' for _ in probe_attrib_dicts(et))
 
 
+@functools.lru_cache(maxsize=_TREE_CACHE_SIZE)
 def probe_idx(et: ET.ElementTree) -> tuple[int, ...]:
     """Try to reconstruct index from probe slot and port.
 
     Normally 2 slots: each with 3 ports in use.
     """
-    slots, ports = probe_attrib(et, 'slot'), probe_attrib(et, 'port')
+    probes = probe_attrib_dicts(et)
+    slots = [int(probe['slot']) for probe in probes]
+    ports = [int(probe['port']) for probe in probes]
+    first_slot, num_ports = min(slots, default=0), len(set(ports))
     result = tuple(
-        (int(s) - int(min(slots))) * len(set(ports)) + int(p) - 1
-        for s, p in zip(slots, ports)
+        (s - first_slot) * num_ports + p - 1 for s, p in zip(slots, ports)
     )
     if not all(idx in range(6) for idx in result):
         raise ValueError(
@@ -147,9 +232,10 @@ def probe_idx(et: ET.ElementTree) -> tuple[int, ...]:
 
 
 def probe_letters(et: ET.ElementTree) -> tuple[str, ...]:
-    return tuple('ABCDEF'[idx] for idx in probe_idx(et))
+    return tuple(map('ABCDEF'.__getitem__, probe_idx(et)))
 
 
+@functools.lru_cache(maxsize=_TREE_CACHE_SIZE)
 def open_ephys_version(et: ET.ElementTree) -> str:
     result = get_tag_text(et, 'version')
     if not result:
@@ -158,7 +244,22 @@ def open_ephys_version(et: ET.ElementTree) -> str:
 
 
 def settings_xml_md5(path: str | pathlib.Path) -> str:
-    return hashlib.md5(pathlib.Path(path).read_bytes()).hexdigest()
+    path = pathlib.Path(path)
+    stat = path.stat()
+    return _md5(path.as_posix(), stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=256)
+def _md5(path: str, mtime_ns: int, size: int) -> str:
+    """Hashed once per path, until the file is modified. Streamed, so the
+    file is never held in memory in full."""
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):   # py>=3.11
+            return hashlib.file_digest(f, 'md5').hexdigest()
+        md5 = hashlib.md5()
+        for chunk in iter(functools.partial(f.read, 1 << 20), b''):
+            md5.update(chunk)
+    return md5.hexdigest()
 
 
 if __name__ == '__main__':
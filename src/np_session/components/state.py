@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import abc
-from typing import Any, Iterator
+from typing import Any, Iterable, Iterator, Mapping
 
 import np_logging
 from typing_extensions import Protocol, runtime_checkable
@@ -19,6 +19,18 @@ class State(Protocol):
     def connect(cls) -> None:
         """Connect to the database."""
 
+    @classmethod
+    def get_many(cls, ids: Iterable[str | int]) -> dict[str, Mapping[str, Any]]:
+        """Fetch the state for multiple ids in one round-trip."""
+        ...
+
+    def __enter__(self) -> State:
+        """Buffer writes until exit, then commit them together."""
+        ...
+
+    def __exit__(self, exc_type, *args) -> None:
+        ...
+
     def __getitem__(self, key: str) -> Any:
         ...
 
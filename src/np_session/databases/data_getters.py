@@ -6,15 +6,85 @@ Created on Tue Jun  9 14:33:49 2020
 """
 from __future__ import annotations
 
+import concurrent.futures
+import contextlib
 import datetime
+import fnmatch
+import functools
 import glob
 import json
 import os
 import pathlib
-from typing import ClassVar
+import re
+import threading
+from typing import Iterator, Optional
 
 import psycopg2
 import psycopg2.extras
+import psycopg2.pool
+
+try:
+    from functools import cached_property
+except ImportError:  # Python < 3.8
+    from backports.cached_property import cached_property
+
+_LIMS_CONNECTION_KWARGS = dict(
+    dbname='lims2',
+    user='limsreader',
+    host='limsdb2',
+    password='limsro',
+    port=5432,
+)
+
+_POOL: Optional[psycopg2.pool.ThreadedConnectionPool] = None
+_POOL_LOCK = threading.Lock()
+_POOL_MAXCONN = 8
+_POOL_SLOTS = threading.BoundedSemaphore(_POOL_MAXCONN)
+"""Held while a connection is checked out: the pool raises when it's
+exhausted, so callers wait here for a free connection instead."""
+
+
+def get_psql_pool() -> psycopg2.pool.ThreadedConnectionPool:
+    """Pool of connections to the lims postgres database, created on first
+    call and shared by all threads."""
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = psycopg2.pool.ThreadedConnectionPool(
+                    minconn=1,
+                    maxconn=_POOL_MAXCONN,
+                    **_LIMS_CONNECTION_KWARGS,
+                )
+    return _POOL
+
+
+@contextlib.contextmanager
+def psql_cursor(as_dict=True) -> Iterator[psycopg2.extensions.cursor]:
+    """Cursor on a pooled, read-only connection to the lims postgres
+    database - the connection goes back to the pool on exit. Blocks while
+    all pooled connections are in use.
+
+    >>> with psql_cursor() as cur: # doctest: +SKIP
+    ...     cur.execute('SELECT 1 AS one')
+    ...     cur.fetchall()
+    [RealDictRow([('one', 1)])]
+    """
+    pool = get_psql_pool()
+    with _POOL_SLOTS:
+        con = pool.getconn()
+        try:
+            if not con.autocommit:
+                con.set_session(readonly=True, autocommit=True)
+            with con.cursor(
+                cursor_factory=psycopg2.extras.RealDictCursor
+                if as_dict
+                else None,
+            ) as cur:
+                yield cur
+        finally:
+            # don't hand a dead connection to the next caller
+            pool.putconn(con, close=bool(con.closed))
 
 
 class NoBehaviorSessionError(Exception):
@@ -29,22 +99,24 @@ def get_foraging_id_from_behavior_session(
     mouse_id: int | str, start: datetime.datetime, end: datetime.datetime
 ) -> str:
     fmt = '%Y-%m-%d %H:%M'
-    query = f"""
+    query = """
             SELECT foraging_id
             FROM behavior_sessions bs
                 JOIN specimens sp ON sp.donor_id = bs.donor_id
-            WHERE date_of_acquisition between '{start.strftime(fmt)}' and '{end.strftime(fmt)}'
-            and external_specimen_name = '{mouse_id}'
+            WHERE date_of_acquisition between %s and %s
+            and external_specimen_name = %s
             """
-    cur = get_psql_cursor()
-    cur.execute(query)
-    info_list = []
-    if cur.rowcount == 0:
+    with psql_cursor() as cur:
+        cur.execute(
+            query, (start.strftime(fmt), end.strftime(fmt), str(mouse_id))
+        )
+        rowcount = cur.rowcount
+        info_list = cur.fetchall() if rowcount else []
+    if rowcount == 0:
         raise NoBehaviorSessionError(
             f'No behavior session found for MID {mouse_id} between {start} and {end}'
         )
-    elif cur.rowcount != 0:
-        info_list = cur.fetchall()
+    elif rowcount != 0:
         if len(info_list) > 1:
             raise MultipleBehaviorSessionsError(
                 f'Multiple behavior sessions found for MID {mouse_id} between {start} and {end}'
@@ -76,62 +148,27 @@ def get_sess_probes(session_id):
     The sessions's id value
     Returns
     -------
-    info_list: str
-    A list of the session's passing probes
+    probe_ids: list[int]
+    The ids of the session's probes, via a single query
     """
     EPHYS_PROBE_QRY = """
     SELECT es.workflow_state,
         ARRAY_AGG(ep.id ORDER BY ep.id) AS ephys_probe_ids
     FROM ecephys_sessions es
         LEFT JOIN ecephys_probes ep ON ep.ecephys_session_id = es.id
-    WHERE es.id = {}
+    WHERE es.id = %s
     GROUP BY es.id
     """
-    PROBE_ID_QRY = """
-    SELECT ep.name,
-        ep.workflow_state,
-        ep.storage_directory
-    FROM ecephys_probes ep
-        JOIN ecephys_sessions es ON es.id = ep.ecephys_session_id
-    WHERE ep.id = {}
-    """
-    cur = get_psql_cursor(get_cred_location())
-    lims_query = EPHYS_PROBE_QRY.format(session_id)
-    cur.execute(lims_query)
-    info_list = []
-    if cur.rowcount == 0:
-        raise Exception('No data was found for ID {}'.format(session_id))
-    elif cur.rowcount != 0:
+    with psql_cursor(as_dict=False) as cur:
+        cur.execute(EPHYS_PROBE_QRY, (session_id,))
         info_list = cur.fetchall()
-        probes_list = []
-        probes_id_list = info_list[0][1]
-        return probes_id_list
-        # returning probe IDs early - need to know only if they exist
-        for probe_id in probes_id_list:
-            print(probe_id)
-            probe_query = PROBE_ID_QRY.format(probe_id)
-            cur.execute(probe_query)
-            if cur.rowcount == 0:
-                raise Exception(
-                    'No data was found for ID {}'.format(session_id)
-                )
-            else:
-                probe_name_status = cur.fetchall()
-                probe_status = probe_name_status[0][1]
-                probe_name = probe_name_status[0][0]
-                probe_storage = probe_name_status[0][2]
-                print(probe_storage)
-                if (
-                    probe_status == 'passed' or probe_status == 'created'
-                ) and probe_storage is not None:
-                    if (probe_status) == 'passed':
-                        print(probe_name)
-                    else:
-                        print(probe_name + ' is created, but not passed')
-                    probes_list.append(probe_name)
-        return probes_list
+    if not info_list:
+        raise Exception('No data was found for ID {}'.format(session_id))
+    # returning probe IDs only - need to know only if they exist
+    return info_list[0][1]
 
 
+@functools.lru_cache(maxsize=1)
 def get_cred_location():
     """Gets content of firebase credential file
     Files are ignored and not committed to the repository
@@ -149,6 +186,8 @@ def get_cred_location():
 
 def get_psql_cursor(as_dict=True):
     """Initializes a connection to the postgres database
+
+    The connection isn't pooled or closed: prefer `with psql_cursor() as cur`.
     Parameters
     ----------
     cred_json: str
@@ -169,14 +208,7 @@ def get_psql_cursor(as_dict=True):
     A connection to the postgres database
     """
 
-    dbname = 'lims2'
-    user = 'limsreader'
-    host = 'limsdb2'
-    password = 'limsro'
-    port = 5432
-    con = psycopg2.connect(
-        dbname=dbname, user=user, host=host, password=password, port=port
-    )
+    con = psycopg2.connect(**_LIMS_CONNECTION_KWARGS)
     con.set_session(readonly=True, autocommit=True)
     if as_dict:
         return con.cursor(
@@ -215,81 +247,117 @@ class data_getter:
         pass
 
 
+_PROBE_NAME_SUFFIX = {
+    'probeA': 'ABC',
+    'probeB': 'ABC',
+    'probeC': 'ABC',
+    'probeD': 'DEF',
+    'probeE': 'DEF',
+    'probeF': 'DEF',
+}
+"""Suffix for raw data names: probes ABC and DEF are recorded together."""
+
+
 class lims_data_getter(data_getter):
 
-    con: ClassVar[psycopg2.connection]
-    cursor: ClassVar[psycopg2.cursor]
+    WKF_QRY = """
+        SELECT es.id AS es_id, 
+            es.name AS es,
+            es.storage_directory,
+            es.workflow_state,
+            es.date_of_acquisition,
+            es.stimulus_name,
+            es.foraging_id as foraging_id,
+            sp.external_specimen_name,
+            isi.id AS isi_experiment_id,
+            e.name AS rig,
+            u.login AS operator,
+            p.code AS project,
+            wkft.name AS wkft, 
+            wkf.storage_directory || wkf.filename AS wkf_path,
+            bs.storage_directory AS behavior_dir
+        FROM ecephys_sessions es
+            JOIN specimens sp ON sp.id = es.specimen_id
+            LEFT JOIN isi_experiments isi ON isi.id = es.isi_experiment_id
+            LEFT JOIN equipment e ON e.id = es.equipment_id
+            LEFT JOIN users u ON u.id = es.operator_id
+            JOIN projects p ON p.id = es.project_id
+            LEFT JOIN well_known_files wkf ON wkf.attachable_id = es.id
+            LEFT JOIN well_known_file_types wkft ON wkft.id=wkf.well_known_file_type_id
+            LEFT JOIN behavior_sessions bs ON bs.foraging_id = es.foraging_id
+        WHERE es.id = %s
+        ORDER BY es.id
+        """
+    IMAGE_QRY = """
+        SELECT es.id AS es_id, es.name AS es, imt.name AS image_type, es.storage_directory || im.jp2 AS image_path
+        FROM ecephys_sessions es
+            JOIN observatory_associated_data oad ON oad.observatory_record_id = es.id AND oad.observatory_record_type = 'EcephysSession'
+            JOIN images im ON im.id=oad.observatory_file_id AND oad.observatory_file_type = 'Image'
+            JOIN image_types imt ON imt.id=im.image_type_id
+        WHERE es.id = %s
+        ORDER BY es.id, imt.name;
+        """
+    WKF_PROBE_QRY = """
+        SELECT es.id AS es_id, 
+            es.name AS es, 
+            ep.name AS ep, 
+            ep.id AS ep_id, 
+            wkft.name AS wkft, 
+            wkf.storage_directory || wkf.filename AS wkf_path
+        FROM ecephys_sessions es
+            JOIN ecephys_probes ep ON ep.ecephys_session_id=es.id
+            LEFT JOIN well_known_files wkf ON wkf.attachable_id = ep.id
+            LEFT JOIN well_known_file_types wkft ON wkft.id=wkf.well_known_file_type_id
+        WHERE es.id = %s 
+        ORDER BY es.id, ep.name;
+        """
 
     def connect(self, exp_id, base_dir):
-        # set up connection to lims
-        if not hasattr(self.__class__, 'con'):
-            self.__class__.con = psycopg2.connect(
-                dbname='lims2',
-                user='limsreader',
-                host='limsdb2',
-                password='limsro',
-                port=5432,
-            )
-            self.con.set_session(
-                readonly=True,
-                autocommit=True,
-            )
-        if not hasattr(self.__class__, 'cursor'):
-            self.__class__.cursor = self.con.cursor(
-                cursor_factory=psycopg2.extras.RealDictCursor,
+        # connections to lims are checked out of the pool per query, so
+        # long-lived instances don't hold on to one
+        self.lims_id = exp_id
+        # the three queries for `get_exp_data`, `get_image_data` and
+        # `get_probe_data` are independent: run them concurrently, on separate
+        # pooled connections, to wait on one round-trip instead of three
+        names = ('WKF_QRY', 'IMAGE_QRY', 'WKF_PROBE_QRY')
+        with concurrent.futures.ThreadPoolExecutor(len(names)) as executor:
+            self._prefetched = dict(
+                zip(
+                    names,
+                    executor.map(
+                        self.query, (getattr(self, _) for _ in names)
+                    ),
+                )
             )
 
-        self.lims_id = exp_id
+    def prefetched(self, name: str) -> list[dict]:
+        """Rows for one of the class's queries, fetched in `connect`."""
+        rows = self._prefetched.pop(name, None)
+        if rows is None:
+            rows = self.query(getattr(self, name))
+        return rows
+
+    def query(self, sql: str) -> list[dict]:
+        with psql_cursor() as cursor:
+            cursor.execute(sql, (self.lims_id,))
+            return cursor.fetchall()
 
     def get_exp_data(self):
         """Get all the experiment files
         eg sync, pkls, videos etc
         """
-        WKF_QRY = """
-            SELECT es.id AS es_id, 
-                es.name AS es,
-                es.storage_directory,
-                es.workflow_state,
-                es.date_of_acquisition,
-                es.stimulus_name,
-                es.foraging_id as foraging_id,
-                sp.external_specimen_name,
-                isi.id AS isi_experiment_id,
-                e.name AS rig,
-                u.login AS operator,
-                p.code AS project,
-                wkft.name AS wkft, 
-                wkf.storage_directory || wkf.filename AS wkf_path,
-                bs.storage_directory AS behavior_dir
-            FROM ecephys_sessions es
-                JOIN specimens sp ON sp.id = es.specimen_id
-                LEFT JOIN isi_experiments isi ON isi.id = es.isi_experiment_id
-                LEFT JOIN equipment e ON e.id = es.equipment_id
-                LEFT JOIN users u ON u.id = es.operator_id
-                JOIN projects p ON p.id = es.project_id
-                LEFT JOIN well_known_files wkf ON wkf.attachable_id = es.id
-                LEFT JOIN well_known_file_types wkft ON wkft.id=wkf.well_known_file_type_id
-                LEFT JOIN behavior_sessions bs ON bs.foraging_id = es.foraging_id
-            WHERE es.id = {}
-            ORDER BY es.id
-            """
-        #
-
-        self.cursor.execute(WKF_QRY.format(self.lims_id))
-        exp_data = self.cursor.fetchall()
+        exp_data = self.prefetched('WKF_QRY')
         if not exp_data:
             return
+        # update data_dict to have all the experiment metadata, but not the
+        # wkf stuff, which differs per row
         self.data_dict.update(
-            exp_data[0]
-        )  # update data_dict to have all the experiment metadata
-        [
-            self.data_dict.pop(key) for key in ['wkft', 'wkf_path']
-        ]  # ...but remove the wkf stuff
-
+            (key, value)
+            for key, value in exp_data[0].items()
+            if key not in ('wkft', 'wkf_path')
+        )
         for e in exp_data:
-            wkft = e['wkft']
-            wkf_path = e['wkf_path']
-            self.data_dict[wkft] = convert_lims_path(wkf_path)
+            self.data_dict[e['wkft']] = convert_lims_path(e['wkf_path'])
 
         self.translate_wkf_names()
 
@@ -307,19 +375,7 @@ class lims_data_getter(data_getter):
 
     def get_image_data(self):
         """Get all the images associated with this experiment"""
-
-        IMAGE_QRY = """
-            SELECT es.id AS es_id, es.name AS es, imt.name AS image_type, es.storage_directory || im.jp2 AS image_path
-            FROM ecephys_sessions es
-                JOIN observatory_associated_data oad ON oad.observatory_record_id = es.id AND oad.observatory_record_type = 'EcephysSession'
-                JOIN images im ON im.id=oad.observatory_file_id AND oad.observatory_file_type = 'Image'
-                JOIN image_types imt ON imt.id=im.image_type_id
-            WHERE es.id = {}
-            ORDER BY es.id, imt.name;
-            """
-
-        self.cursor.execute(IMAGE_QRY.format(self.lims_id))
-        image_data = self.cursor.fetchall()
+        image_data = self.prefetched('IMAGE_QRY')
 
         # FOR NOW JUST ASSUME IMAGES ARE IN THE D1 UPLOAD DIRECTORY
         # get D1 directory (assume this is where the sync file is)
@@ -337,27 +393,15 @@ class lims_data_getter(data_getter):
         rather than just grabbing the base directories
 
         """
+        probe_data = self.prefetched('WKF_PROBE_QRY')
 
-        WKF_PROBE_QRY = """
-            SELECT es.id AS es_id, 
-                es.name AS es, 
-                ep.name AS ep, 
-                ep.id AS ep_id, 
-                wkft.name AS wkft, 
-                wkf.storage_directory || wkf.filename AS wkf_path
-            FROM ecephys_sessions es
-                JOIN ecephys_probes ep ON ep.ecephys_session_id=es.id
-                LEFT JOIN well_known_files wkf ON wkf.attachable_id = ep.id
-                LEFT JOIN well_known_file_types wkft ON wkft.id=wkf.well_known_file_type_id
-            WHERE es.id = {} 
-            ORDER BY es.id, ep.name;
-            """
-        self.cursor.execute(WKF_PROBE_QRY.format(self.lims_id))
-        probe_data = self.cursor.fetchall()
-
-        p_info = [
-            p for p in probe_data if p['wkft'] == 'EcephysSortedAmplitudes'
-        ]
+        p_info = []
+        raw = []
+        for p in probe_data:
+            if p['wkft'] == 'EcephysSortedAmplitudes':
+                p_info.append(p)
+            elif p['wkft'] == 'EcephysProbeRawData':
+                raw.append(p)
 
         def getnesteddir(x):
             return os.path.dirname(os.path.dirname(os.path.dirname(x)))
@@ -376,18 +420,9 @@ class lims_data_getter(data_getter):
             info_json = glob_file(os.path.join(pb, '*probe_info*json'))
             self.data_dict['probe' + probeID + '_info'] = info_json
 
-        raw = [p for p in probe_data if p['wkft'] == 'EcephysProbeRawData']
-        name_suffix = {
-            'probeA': 'ABC',
-            'probeB': 'ABC',
-            'probeC': 'ABC',
-            'probeD': 'DEF',
-            'probeE': 'DEF',
-            'probeF': 'DEF',
-        }
         for r in raw:
             probeID = r['ep']
-            name = r['wkft'] + name_suffix[probeID]
+            name = r['wkft'] + _PROBE_NAME_SUFFIX[probeID]
             path = convert_lims_path(r['wkf_path'])
 
             if (
@@ -409,10 +444,9 @@ class lims_data_getter(data_getter):
         WKF_QRY = """
             SELECT es.storage_directory
             FROM ecephys_sessions es
-            WHERE es.id = {}
+            WHERE es.id = %s
             """
-        self.cursor.execute(WKF_QRY.format(self.lims_id))
-        exp_data = self.cursor.fetchall()
+        exp_data = self.query(WKF_QRY)
         if exp_data and exp_data[0]['storage_directory']:
             return '/' + exp_data[0]['storage_directory']
         return None
@@ -430,6 +464,47 @@ class lims_data_getter(data_getter):
                 self.data_dict[wkf_dict[wkf]] = self.data_dict[wkf]
 
 
+_LOCAL_EXP_FILE_GLOBS: dict[str, tuple[str, ...]] = {
+    'mapping_pkl': ('*mapping*.pkl', '*stim.pkl'),
+    'replay_pkl': ('*replay*.pkl',),
+    'behavior_pkl': ('*behavior*.pkl',),
+    'opto_pkl': ('*opto*.pkl',),
+    'sync_file': ('*.sync',),
+    'RawEyeTrackingVideo': ('*.eye.avi', '*eye.mp4'),
+    'RawBehaviorTrackingVideo': ('*behavior.avi', '*behavior.mp4'),
+    'RawFaceTrackingVideo': ('*face.avi', '*face.mp4'),
+    'RawEyeTrackingVideoMetadata': ('*eye.json',),
+    'RawBehaviorTrackingVideoMetadata': ('*behavior.json',),
+    'RawFaceTrackingVideoMetadata': ('*face.json',),
+    'EcephysPlatformFile': ('*platformD1.json',),
+    'NewstepConfiguration': ('*motor-locs.csv',),
+}
+"""Globs for session files in a local session folder, in order of preference."""
+
+_LOCAL_IMAGE_FILES: tuple[str, ...] = (
+    'EcephysPostExperimentLeft',
+    'EcephysPostExperimentRight',
+    'EcephysPostInsertionLeft',
+    'EcephysPostInsertionRight',
+    'EcephysPostStimulusLeft',
+    'EcephysPostStimulusRight',
+    'EcephysPreExperimentLeft',
+    'EcephysPreExperimentRight',
+    'EcephysPreInsertionLeft',
+    'EcephysPreInsertionRight',
+    'EcephysInsertionLocationImage',
+    'EcephysOverlayImage',
+    'EcephysBrainSurfaceLeft',
+    'EcephysBrainSurfaceRight',
+)
+"""Images in a local session folder, found via globs in the D1 manifest."""
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_glob(pattern: str) -> re.Pattern:
+    return re.compile(fnmatch.translate(os.path.normcase(pattern)))
+
+
 class local_data_getter(data_getter):
     def connect(self, exp_id, base_dir):
         if os.path.exists(base_dir):
@@ -438,37 +513,12 @@ class local_data_getter(data_getter):
             print('Invalid base directory: ' + base_dir)
 
     def get_exp_data(self):
-        file_glob_dict = {
-            'mapping_pkl': ['*mapping*.pkl', '*stim.pkl'],
-            'replay_pkl': '*replay*.pkl',
-            'behavior_pkl': '*behavior*.pkl',
-            'opto_pkl': '*opto*.pkl',
-            'sync_file': '*.sync',
-            'RawEyeTrackingVideo': ['*.eye.avi', '*eye.mp4'],
-            'RawBehaviorTrackingVideo': ['*behavior.avi', '*behavior.mp4'],
-            'RawFaceTrackingVideo': ['*face.avi', '*face.mp4'],
-            'RawEyeTrackingVideoMetadata': '*eye.json',
-            'RawBehaviorTrackingVideoMetadata': '*behavior.json',
-            'RawFaceTrackingVideoMetadata': '*face.json',
-            'EcephysPlatformFile': '*platformD1.json',
-            'NewstepConfiguration': '*motor-locs.csv',
-        }
-
-        for fn in file_glob_dict:
-            if isinstance(file_glob_dict[fn], list):
-                paths = [
-                    glob_file(os.path.join(self.base_dir, f))
-                    for f in file_glob_dict[fn]
-                ]
-                path = [p for p in paths if p is not None]
-                if len(path) > 0:
-                    self.data_dict[fn] = path[0]
-            else:
-                filepath = glob_file(
-                    os.path.join(self.base_dir, file_glob_dict[fn])
-                )
-                if filepath is not None:
-                    self.data_dict[fn] = filepath
+        for fn, patterns in _LOCAL_EXP_FILE_GLOBS.items():
+            for pattern in patterns:
+                path = self._first_match(self.base_dir, pattern)
+                if path is not None:
+                    self.data_dict[fn] = path
+                    break
 
         basename = os.path.basename(self.base_dir)
         self.data_dict['es_id'] = basename.split('_')[0]
@@ -476,15 +526,48 @@ class local_data_getter(data_getter):
         self.data_dict['datestring'] = basename.split('_')[2]
         self.data_dict['rig'] = self.get_rig_from_platform()
 
-    def get_platform_info(self):
+    def _scan(self, directory: str) -> tuple[str, ...]:
+        """Names of everything in `directory`, listed once per instance."""
+        try:
+            return self._scanned[directory]
+        except AttributeError:
+            self._scanned: dict[str, tuple[str, ...]] = {}
+        except KeyError:
+            pass
+        try:
+            with os.scandir(directory) as entries:
+                names = tuple(entry.name for entry in entries)
+        except OSError:
+            names = ()
+        self._scanned[directory] = names
+        return names
+
+    def _first_match(self, directory: str, pattern: str) -> str | None:
+        """Equivalent to `glob_file(os.path.join(directory, pattern))`, but
+        single-level patterns are matched against a cached listing of
+        `directory`, so each directory is only read once."""
+        if any(_ in pattern for _ in ('/', '\\', '**')):
+            return glob_file(os.path.join(directory, pattern))
+        match = _compile_glob(pattern).match
+        for name in self._scan(directory):
+            # glob skips hidden files unless the pattern asks for them
+            if name.startswith('.') and not pattern.startswith('.'):
+                continue
+            if match(os.path.normcase(name)):
+                return os.path.join(directory, name)
+        return None
+
+    @cached_property
+    def platform_info(self) -> dict:
+        """Contents of the platform json, read once."""
         platform_file = self.data_dict['EcephysPlatformFile']
         with open(platform_file, 'r') as file:
-            self.platform_info = json.load(file)
+            return json.load(file)
 
-    def get_rig_from_platform(self):
-        if not hasattr(self, 'platform_info'):
-            self.get_platform_info()
+    def get_platform_info(self):
+        return self.platform_info
 
+    def get_rig_from_platform(self):
         return self.platform_info['rig_id']
 
     def get_probe_data(self):
@@ -493,17 +576,15 @@ class local_data_getter(data_getter):
         # get probe dirs
         for probeID in 'ABCDEF':
             if self.cortical_sort:
-                probe_base = glob_file(
-                    os.path.join(
-                        self.base_dir, 'cortical*probe' + probeID + '_sorted'
-                    )
+                probe_base = self._first_match(
+                    self.base_dir, 'cortical*probe' + probeID + '_sorted'
                 )
-                lfp_base = glob_file(
-                    os.path.join(self.base_dir, '*probe' + probeID + '_sorted')
+                lfp_base = self._first_match(
+                    self.base_dir, '*probe' + probeID + '_sorted'
                 )
             else:
-                probe_base = glob_file(
-                    os.path.join(self.base_dir, '*probe' + probeID + '_sorted')
+                probe_base = self._first_match(
+                    self.base_dir, '*probe' + probeID + '_sorted'
                 )
                 lfp_base = probe_base
 
@@ -511,24 +592,18 @@ class local_data_getter(data_getter):
                 self.data_dict['data_probes'].append(probeID)
                 self.data_dict['probe' + probeID] = probe_base
 
-                metrics_file = glob_file(
-                    os.path.join(
-                        probe_base,
-                        r'continuous\Neuropix-PXI-100.0\metrics.csv',
-                    )
+                metrics_file = self._first_match(
+                    probe_base,
+                    r'continuous\Neuropix-PXI-100.0\metrics.csv',
                 )
                 self.data_dict['probe' + probeID + '_metrics'] = metrics_file
 
-                info_json = glob_file(
-                    os.path.join(probe_base, '*probe_info*json')
-                )
+                info_json = self._first_match(probe_base, '*probe_info*json')
                 self.data_dict['probe' + probeID + '_info'] = info_json
 
-                channel_map = glob_file(
-                    os.path.join(
-                        probe_base,
-                        r'continuous\Neuropix-PXI-100.0\channel_map.npy',
-                    )
+                channel_map = self._first_match(
+                    probe_base,
+                    r'continuous\Neuropix-PXI-100.0\channel_map.npy',
                 )
                 self.data_dict[
                     'probe' + probeID + '_channel_map'
@@ -541,41 +616,24 @@ class local_data_getter(data_getter):
         # GET PROBE DEPTH IMAGES
         for probeID in self.data_dict['data_probes']:
             probe_base = self.data_dict['probe' + probeID]
-            probe_depth_image = glob_file(
-                os.path.join(probe_base, 'probe_depth*.png')
+            probe_depth_image = self._first_match(
+                probe_base, 'probe_depth*.png'
             )
             if probe_depth_image is not None:
                 self.data_dict['probe_depth_' + probeID] = probe_depth_image
 
         # GET OTHER IMAGE FILES
-        # image_files = [k for k in D1_local if 'image' in k]
-        image_files = [
-            'EcephysPostExperimentLeft',
-            'EcephysPostExperimentRight',
-            'EcephysPostInsertionLeft',
-            'EcephysPostInsertionRight',
-            'EcephysPostStimulusLeft',
-            'EcephysPostStimulusRight',
-            'EcephysPreExperimentLeft',
-            'EcephysPreExperimentRight',
-            'EcephysPreInsertionLeft',
-            'EcephysPreInsertionRight',
-            'EcephysInsertionLocationImage',
-            'EcephysOverlayImage',
-            'EcephysBrainSurfaceLeft',
-            'EcephysBrainSurfaceRight',
-        ]
         from np_session.components.lims_manifests import Manifest, MANIFESTS
 
         manifest = Manifest(self.base_dir)
-
-        for im in image_files:
-            rel_path = manifest.globs[
-                manifest.names.index(MANIFESTS['_lims_name'][im])
-            ]
-            im_file = glob_file(os.path.join(self.base_dir, rel_path))
-
-            self.data_dict[im] = im_file
+        name_glob = dict(zip(manifest.names, manifest.globs))
+        lims_name = MANIFESTS['_lims_name']
+        for im in _LOCAL_IMAGE_FILES:
+            # single-level globs are matched against the same cached listing
+            # of the session folder as everything else
+            self.data_dict[im] = self._first_match(
+                self.base_dir, name_glob[lims_name[im]]
+            )
 
 
 def glob_file(file_path):
@@ -586,6 +644,7 @@ def glob_file(file_path):
         return None
 
 
+@functools.lru_cache(maxsize=1024)
 def convert_lims_path(path):
     if path is not None:
         new_path = r'\\' + os.path.normpath(path)[1:]
@@ -609,9 +668,9 @@ def convert_path_str_to_pathlib(data_dict_orig) -> dict:
     >>> test[1].as_posix()
     '//allen/programs/mindscope'
     """
-    data_dict = data_dict_orig.copy()
-    for k, v in data_dict.items():
-        if isinstance(v, str) and (v.startswith('/') or v.startswith('\\')):
+    data_dict = dict(data_dict_orig)
+    for k, v in data_dict_orig.items():
+        if isinstance(v, str) and v.startswith(('/', '\\')):
             v = v.replace('\\', '/')
             if v[:2] != '//':
                 v = '/' + v
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import copy
 import doctest
 import pathlib
+import threading
+import time
 from collections.abc import MutableMapping
-from typing import ClassVar, Iterator, Union
+from typing import ClassVar, Iterable, Iterator, Optional, Union
 
 import firebase_admin
 import firebase_admin.firestore as firestore
@@ -38,6 +41,18 @@ class State(MutableMapping):
 
     db: ClassVar
 
+    _connect_lock: ClassVar[threading.Lock] = threading.Lock()
+    DOC_TTL: ClassVar[float] = 5.0
+    """Seconds a fetched document is reused before reading it again."""
+    _doc_cache: ClassVar[dict[str, tuple[float, dict[str, AcceptedType]]]] = {}
+    """Contents of documents by id, with the `time.monotonic()` they were
+    fetched - shared by all instances, so values are copied in and out."""
+
+    _snapshot: Optional[dict[str, AcceptedType]] = None
+    """Local copy of the document while writes are batched (see `__enter__`)."""
+    _pending: Optional[dict[str, AcceptedType]] = None
+    """Writes to commit in a single update on `__exit__`."""
+
     def __init__(self, id: int | str) -> None:
         self.id = str(id)
         try:
@@ -46,48 +61,192 @@ class State(MutableMapping):
             self.__class__.connect()
 
     def __repr__(self) -> str:
-        return repr(self.session_doc.get().to_dict())
+        return repr(self._contents())
 
     @classmethod
     def connect(cls) -> None:
-        key_path = pathlib.Path(
-            '//allen/scratch/aibstemp/arjun.sridhar/db_key.json'
-        )
-        cred = firebase_admin.credentials.Certificate(key_path)
-        cls.app = firebase_admin.initialize_app(cred)
-        cls.db = firestore.client().collection('session_state')
-        # cls.ref = cls.db.reference('/session_state') # root user, can create users and add them also if needed
+        # serialized, so racing callers wait for one connection instead of
+        # initializing the app twice
+        with cls._connect_lock:
+            if hasattr(cls, 'db'):
+                return
+            key_path = pathlib.Path(
+                '//allen/scratch/aibstemp/arjun.sridhar/db_key.json'
+            )
+            cred = firebase_admin.credentials.Certificate(key_path)
+            cls.app = firebase_admin.initialize_app(cred)
+            cls.client = firestore.client()
+            cls.db = cls.client.collection('session_state')
+            # cls.ref = cls.db.reference('/session_state') # root user, can create users and add them also if needed
+
+    @classmethod
+    def connect_in_background(cls) -> threading.Thread:
+        """Start connecting in a daemon thread, so other setup can run in the
+        meantime: the first `State(...)` waits for it to finish."""
+        thread = threading.Thread(target=cls.connect, daemon=True)
+        thread.start()
+        return thread
+
+    @classmethod
+    def get_many(cls, ids: Iterable[int | str]) -> dict[str, dict[str, AcceptedType]]:
+        """Fetch the state for multiple ids in a single round-trip.
+
+        Ids without an existing document are omitted from the result.
+        """
+        try:
+            _ = cls.db
+        except AttributeError:
+            cls.connect()
+        refs = [cls.db.document(str(_)) for _ in ids]
+        if not refs:
+            return {}
+        return {
+            snapshot.id: snapshot.to_dict()
+            for snapshot in cls.client.get_all(refs)
+            if snapshot.exists
+        }
+
+    def __enter__(self) -> State:
+        """Buffer reads and writes locally, then commit all writes in a single
+        update on exit.
+
+        >>> with State(123456) as state:
+        ...     state['new'] = 1
+        ...     state['new'] += 1
+        >>> State(123456).pop('new')
+        2
+        """
+        self._snapshot = copy.deepcopy(self._get_dict())
+        self._pending = {}
+        return self
+
+    def __exit__(self, exc_type, *args) -> None:
+        pending = self._pending
+        self._snapshot = self._pending = None
+        if exc_type is None and pending:
+            self._update(pending)
+
+    def bulk_update(
+        self,
+        mapping: Union[
+            dict[str, AcceptedType], Iterable[tuple[str, AcceptedType]]
+        ] = (),
+        deletes: Iterable[str] = (),
+    ) -> None:
+        """Set and delete multiple fields in a single write.
+
+        >>> state = State(123456)
+        >>> state.bulk_update({'a': 1, 'b': 2})
+        >>> state.bulk_update({'c': 3}, deletes=('a', 'b'))
+        >>> state.pop('c'), 'a' in state, 'b' in state
+        (3, False, False)
+        """
+        fields = dict(mapping)
+        fields.update(dict.fromkeys(deletes, firestore.DELETE_FIELD))
+        if not fields:
+            return
+        if self._snapshot is not None:
+            for key, value in fields.items():
+                if value is firestore.DELETE_FIELD:
+                    self._snapshot.pop(key, None)
+                else:
+                    self._snapshot[key] = value
+            self._pending.update(fields)
+            return
+        self._update(fields)
+
+    def update(self, *args, **kwargs) -> None:
+        """Same as `dict.update`, but all fields are written at once."""
+        self.bulk_update(dict(*args, **kwargs))
 
     @property
     def session_doc(self):
         """
         returns document snapshot
         """
-        doc = self.db.document(str(self.id))
-        if doc.get().to_dict() is None:
+        self._get_dict()   # creates the document if it doesn't exist
+        return self.db.document(self.id)
+
+    def _get_dict(self) -> dict[str, AcceptedType]:
+        """Contents of the document, fetched at most once every `DOC_TTL`
+        seconds."""
+        cached = self._doc_cache.get(self.id)
+        if cached is not None and time.monotonic() - cached[0] < self.DOC_TTL:
+            return cached[1]
+        doc = self.db.document(self.id)
+        contents = doc.get().to_dict()
+        if contents is None:
             doc.set({})
-        return doc
+            contents = {}
+        self._doc_cache[self.id] = (time.monotonic(), contents)
+        return contents
+
+    def _update(self, fields: dict[str, AcceptedType]) -> None:
+        """Write fields to the document, and apply them to the cached copy so
+        the next read doesn't need to fetch it again."""
+        self.session_doc.update(fields)
+        cached = self._doc_cache.get(self.id)
+        if cached is None:
+            return
+        if any('.' in key for key in fields):
+            # dotted keys are nested field paths in Firestore: re-fetch
+            # instead of emulating them
+            self._doc_cache.pop(self.id, None)
+            return
+        for key, value in fields.items():
+            if value is firestore.DELETE_FIELD:
+                cached[1].pop(key, None)
+            else:
+                cached[1][key] = copy.deepcopy(value)
+
+    def _contents(self) -> dict[str, AcceptedType]:
+        """The batched local copy while in a `with` block, otherwise the
+        cached document."""
+        if self._snapshot is not None:
+            return self._snapshot
+        return self._get_dict()
+
+    def snapshot(self) -> dict[str, AcceptedType]:
+        """Copy of all fields in the document, from a single read.
+
+        >>> isinstance(State(123456).snapshot(), dict)
+        True
+        """
+        return copy.deepcopy(self._contents())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._contents()
 
     def __getitem__(self, key: str) -> AcceptedType:
-        return self.session_doc.get().to_dict()[key]
+        # a copy, so mutating the value can't change the shared cache
+        return copy.deepcopy(self._contents()[key])
 
     def __delitem__(self, key: str) -> None:
         """
         deletes field from database for session
         """
-        self.session_doc.update({key: firestore.DELETE_FIELD})
+        if self._snapshot is not None:
+            # missing keys are ignored, as they are outside a batch
+            self._snapshot.pop(key, None)
+            self._pending[key] = firestore.DELETE_FIELD
+            return
+        self._update({key: firestore.DELETE_FIELD})
 
     def __len__(self) -> int:
-        return len(self.session_doc.get().to_dict())
+        return len(self._contents())
 
     def __setitem__(self, key: str, value: AcceptedType) -> None:
         """
         updates the database with the key value item
         """
-        return self.session_doc.update({key: value})
+        if self._snapshot is not None:
+            self._snapshot[key] = self._pending[key] = value
+            return
+        return self._update({key: value})
 
     def __iter__(self) -> Iterator[str]:
-        return iter(self.session_doc.get().to_dict())
+        # over a copy of the keys, so fields can be deleted while iterating
+        return iter(tuple(self._contents()))
 
 
 if __name__ == '__main__':
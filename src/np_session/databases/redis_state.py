@@ -7,7 +7,7 @@ import collections.abc
 import contextlib
 import doctest
 import pathlib
-from typing import ClassVar, Iterator, Union
+from typing import ClassVar, Iterable, Iterator, Optional, Union
 
 import np_logging
 import redis
@@ -52,6 +52,11 @@ class State(collections.abc.MutableMapping):
 
     db: ClassVar[redis.Redis]
 
+    _snapshot: Optional[dict[str, AcceptedType]] = None
+    """Local copy of the entry while writes are batched (see `__enter__`)."""
+    _pending: Optional[dict[str, AcceptedType | type[KeyError]]] = None
+    """Writes to commit in a single transaction on `__exit__` (`KeyError` marks a deletion)."""
+
     def __init__(self, id: int | str) -> None:
         self.name = str(id)
         try:
@@ -75,6 +80,46 @@ class State(collections.abc.MutableMapping):
         else:
             logger.error('Failed to connect to Redis database')
 
+    @classmethod
+    def get_many(cls, ids: Iterable[int | str]) -> dict[str, dict[str, AcceptedType]]:
+        """Fetch the state for multiple ids in a single pipelined round-trip.
+
+        Ids without an existing entry are omitted from the result.
+        """
+        try:
+            _ = cls.db
+        except AttributeError:
+            cls.connect()
+        names = [str(_) for _ in ids]
+        pipe = cls.db.pipeline()
+        for name in names:
+            pipe.hgetall(name)
+        return {
+            name: {k.decode(): decode(v) for k, v in entry.items()}
+            for name, entry in zip(names, pipe.execute())
+            if entry
+        }
+
+    def __enter__(self) -> State:
+        """Buffer reads and writes locally, then commit all writes in a single
+        transaction on exit."""
+        self._snapshot = self.data
+        self._pending = {}
+        return self
+
+    def __exit__(self, exc_type, *args) -> None:
+        pending = self._pending
+        self._snapshot = self._pending = None
+        if exc_type is not None or not pending:
+            return
+        pipe = self.db.pipeline()
+        for key, value in pending.items():
+            if value is KeyError:
+                pipe.hdel(self.name, key)
+            else:
+                pipe.hset(self.name, key, encode(value))
+        pipe.execute()
+
     @property
     def data(self) -> dict[str, AcceptedType]:
         return {
@@ -83,21 +128,34 @@ class State(collections.abc.MutableMapping):
         }
 
     def __getitem__(self, key: str) -> AcceptedType:
+        if self._snapshot is not None:
+            return self._snapshot[key]
         _ = decode(self.db.hget(self.name, key))
         if _ is None:
             raise KeyError(f'{key!r} not found in Redis db entry {self!r}')
         return _
 
     def __setitem__(self, key: str, value: AcceptedType) -> None:
+        if self._snapshot is not None:
+            self._snapshot[key] = self._pending[key] = value
+            return
         self.db.hset(self.name, key, encode(value))
 
     def __delitem__(self, key: str) -> None:
+        if self._snapshot is not None:
+            self._snapshot.pop(key, None)
+            self._pending[key] = KeyError
+            return
         self.db.hdel(self.name, key)
 
     def __iter__(self) -> Iterator[str]:
+        if self._snapshot is not None:
+            return iter(self._snapshot)
         return iter(self.data)
 
     def __len__(self) -> int:
+        if self._snapshot is not None:
+            return len(self._snapshot)
         return len(self.data)
 
 
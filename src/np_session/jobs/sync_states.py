@@ -15,6 +15,6 @@ def sync_redis_to_firebase() -> None:
 
 
 if __name__ == '__main__':
-    Firebase.connect()
+    Firebase.connect_in_background()
     Redis.connect()
     sync_redis_to_firebase()
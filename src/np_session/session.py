@@ -8,7 +8,10 @@ import os
 import pathlib
 from typing import Any, Iterable, Optional, Type, TypeVar, Union
 
-from backports.cached_property import cached_property
+try:
+    from functools import cached_property
+except ImportError:  # Python < 3.8
+    from backports.cached_property import cached_property
 import np_config
 import np_logging
 from typing_extensions import Literal, Self
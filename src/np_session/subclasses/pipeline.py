@@ -9,7 +9,10 @@ from typing import Iterable, Optional
 
 import np_config
 import np_logging
-from backports.cached_property import cached_property
+try:
+    from functools import cached_property
+except ImportError:  # Python < 3.8
+    from backports.cached_property import cached_property
 from typing_extensions import Literal, Self
 
 from np_session.components.info import Project, User, Mouse
@@ -266,7 +269,7 @@ class PipelineSession(Session):
         """Any QC folders that exist"""
         return [
             path / self.folder
-            for path in QC_PATHS
+            for path in existing_qc_roots()
             if (path / self.folder).exists()
         ] + ([self.qc_path] if self.qc_path.exists() else [])
 
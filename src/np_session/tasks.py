@@ -151,7 +151,7 @@ def latest_session(
 
     session: str | int | None = None
     if isinstance(project, Projects):
-        session = project.latest_session(session_type)
+        session = project.get_latest_session(session_type)
     if isinstance(project, Project):
         session = project.state.get(f'latest_{session_type}')
     if session is None:
@@ -0,0 +1,103 @@
+import itertools
+import os
+
+import pytest
+
+from np_session.databases import data_getters
+from np_session.databases.data_getters import (
+    _LOCAL_EXP_FILE_GLOBS,
+    glob_file,
+    local_data_getter,
+)
+
+SESSION = '1246096278_366122_20230209'
+
+PATTERNS = (
+    *itertools.chain.from_iterable(_LOCAL_EXP_FILE_GLOBS.values()),
+    # representative of the D1 manifest globs used for `_LOCAL_IMAGE_FILES`
+    '*surface-image1-left.png',
+    '*surface-image6-right.png',
+    '*insertionLocation.png',
+    # probe folders and files within them
+    '*probeA_sorted',
+    'cortical*probeA_sorted',
+    '*probe_info*json',
+    '*/spike_times.npy',
+    '.hidden*',
+)
+
+
+@pytest.fixture
+def session_dir(tmp_path):
+    for name in (
+        f'{SESSION}.sync',
+        f'.{SESSION}.sync',  # hidden: skipped by glob
+        f'.{SESSION}.opto.pkl',  # only a hidden match
+        f'{SESSION}.mapping.pkl',
+        f'{SESSION}.stim.pkl',
+        f'{SESSION}.replay.pkl',
+        f'{SESSION}.behavior.pkl',
+        f'{SESSION}.behavior.mp4',
+        f'{SESSION}.behavior.json',
+        f'{SESSION}.eye.mp4',
+        f'{SESSION}.eye.json',
+        f'{SESSION}_platformD1.json',
+        f'old_{SESSION}_platformD1.json',
+        f'{SESSION}_surface-image1-left.png',
+        f'{SESSION}_surface-image6-right.png',
+        '.hidden_file',
+    ):
+        (tmp_path / name).touch()
+    for name in (
+        f'{SESSION}_probeA_sorted',
+        f'{SESSION}.face.mp4',  # a dir matching a pattern for files
+    ):
+        (tmp_path / name).mkdir()
+    (tmp_path / f'{SESSION}_probeA_sorted' / 'spike_times.npy').touch()
+    return tmp_path
+
+
+@pytest.fixture
+def getter():
+    # bypass `__init__`, which reads everything in the session folder
+    getter = local_data_getter.__new__(local_data_getter)
+    getter.data_dict = {}
+    return getter
+
+
+@pytest.mark.parametrize('pattern', PATTERNS)
+def test_first_match_matches_glob_file(session_dir, getter, pattern):
+    directory = str(session_dir)
+    assert getter._first_match(directory, pattern) == glob_file(
+        os.path.join(directory, pattern)
+    )
+
+
+def test_first_match_skips_hidden_files(session_dir, getter):
+    directory = str(session_dir)
+    assert getter._first_match(directory, '*.sync') == os.path.join(
+        directory, f'{SESSION}.sync'
+    )
+    assert getter._first_match(directory, '*opto*.pkl') is None
+    assert getter._first_match(directory, '.hidden*') == os.path.join(
+        directory, '.hidden_file'
+    )
+
+
+def test_first_match_none_if_no_match(session_dir, getter):
+    assert getter._first_match(str(session_dir), '*.missing') is None
+    assert getter._first_match(str(session_dir / 'missing'), '*.sync') is None
+
+
+def test_first_match_lists_each_dir_once(session_dir, getter, monkeypatch):
+    scans = []
+    scandir = data_getters.os.scandir
+
+    def counting_scandir(path):
+        scans.append(path)
+        return scandir(path)
+
+    monkeypatch.setattr(data_getters.os, 'scandir', counting_scandir)
+    for pattern in itertools.chain.from_iterable(_LOCAL_EXP_FILE_GLOBS.values()):
+        getter._first_match(str(session_dir), pattern)
+    assert scans == [str(session_dir)]
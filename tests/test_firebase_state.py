@@ -0,0 +1,103 @@
+import copy
+import types
+
+import pytest
+
+import firebase_admin.firestore as firestore
+from np_session.databases.firebase_state import State
+
+
+class FakeDocument:
+    def __init__(self, collection, id):
+        self.collection = collection
+        self.id = id
+
+    def get(self):
+        contents = copy.deepcopy(self.collection.docs.get(self.id))
+        return types.SimpleNamespace(to_dict=lambda: contents)
+
+    def set(self, fields):
+        self.collection.docs[self.id] = copy.deepcopy(fields)
+
+    def update(self, fields):
+        self.collection.updates.append(dict(fields))
+        doc = self.collection.docs[self.id]
+        for key, value in fields.items():
+            if value is firestore.DELETE_FIELD:
+                doc.pop(key, None)
+            else:
+                doc[key] = copy.deepcopy(value)
+
+
+class FakeCollection:
+    """Stands in for the Firestore `session_state` collection."""
+
+    def __init__(self):
+        self.docs = {}
+        self.updates = []
+
+    def document(self, id):
+        return FakeDocument(self, id)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeCollection()
+    monkeypatch.setattr(State, 'db', db, raising=False)
+    monkeypatch.setattr(State, '_doc_cache', {})
+    return db
+
+
+def test_mutating_a_read_value_leaves_the_cache_intact(db):
+    state = State(1)
+    state['map'] = {'a': [1]}
+    state['map']['a'].append(2)
+    state.snapshot()['map']['b'] = 3
+    assert State(1)['map'] == {'a': [1]}
+    assert db.docs['1']['map'] == {'a': [1]}
+
+
+def test_mutating_a_written_value_leaves_the_cache_intact(db):
+    value = {'a': [1]}
+    state = State(1)
+    state['map'] = value
+    value['a'].append(2)
+    assert State(1)['map'] == {'a': [1]}
+
+
+def test_batched_writes_are_deferred_to_one_update(db):
+    db.docs['1'] = {'old': 0}
+    with State(1) as state:
+        state['a'] = 1
+        state.update(b=2)
+        del state['old']
+        del state['missing']
+        assert db.updates == []
+        assert dict(state) == {'a': 1, 'b': 2}
+    assert db.updates == [
+        {
+            'a': 1,
+            'b': 2,
+            'old': firestore.DELETE_FIELD,
+            'missing': firestore.DELETE_FIELD,
+        }
+    ]
+    assert db.docs['1'] == {'a': 1, 'b': 2}
+
+
+def test_batch_is_discarded_on_error(db):
+    db.docs['1'] = {'old': 0}
+    with pytest.raises(RuntimeError):
+        with State(1) as state:
+            state['a'] = 1
+            del state['old']
+            raise RuntimeError
+    assert db.updates == []
+    assert State(1).snapshot() == {'old': 0}
+
+
+def test_bulk_update_sets_and_deletes_in_one_update(db):
+    db.docs['1'] = {'old': 0}
+    State(1).bulk_update({'a': 1}, deletes=('old',))
+    assert db.updates == [{'a': 1, 'old': firestore.DELETE_FIELD}]
+    assert State(1).snapshot() == {'a': 1}
@@ -0,0 +1,112 @@
+import copy
+import pickle
+
+import pytest
+
+from np_session.components import info
+from np_session.components.info import Mouse, Project, Projects, User
+
+
+@pytest.fixture
+def calls():
+    """Ids requested from the fake `State.get_many`, per call."""
+    return []
+
+
+@pytest.fixture
+def states(monkeypatch, calls):
+    """Project states returned by a fake `State.get_many`."""
+    states = {}
+
+    def get_many(ids):
+        calls.append(tuple(ids))
+        return states
+
+    monkeypatch.setattr(info.State, 'get_many', get_many)
+    return states
+
+
+def test_latest_session_searches_children_in_order(states, calls):
+    first, second, third = Projects.DR.value[:3]
+    states[first] = {'latest_ephys': None}
+    states[second] = {'latest_ephys': 2}
+    states[third] = {'latest_ephys': 3}
+    assert Projects.DR.get_latest_session('ephys') == 2
+    assert calls == [Projects.DR.value]
+
+
+def test_latest_session_skips_falsy_values(states):
+    first, second = Projects.DR.value[:2]
+    states[first] = {'latest_ephys': 0}
+    states[second] = {'latest_ephys': 2}
+    assert Projects.DR.get_latest_session('ephys') == 2
+
+
+def test_latest_session_none_if_no_child_has_one(states):
+    states[Projects.DR.value[0]] = {'latest_hab': 1}
+    assert Projects.DR.get_latest_session('ephys') is None
+
+
+def test_latest_session_none_on_backend_error(monkeypatch):
+    def get_many(ids):
+        raise ConnectionError('backend down')
+
+    monkeypatch.setattr(info.State, 'get_many', get_many)
+    assert Projects.DR.get_latest_session('ephys') is None
+
+
+@pytest.mark.parametrize(
+    'attr, session_type',
+    [
+        ('latest_session', 'ephys'),
+        ('latest_ephys', 'ephys'),
+        ('latest_hab', 'hab'),
+        ('latest_behavior', 'behavior'),
+    ],
+)
+def test_latest_shortcuts(states, attr, session_type):
+    states[Projects.VB.value[0]] = {
+        'latest_ephys': 1,
+        'latest_hab': 2,
+        'latest_behavior': 3,
+    }
+    expected = states[Projects.VB.value[0]][f'latest_{session_type}']
+    value = getattr(Projects.VB, attr)
+    if callable(value):
+        value = value()
+    assert value == expected
+
+
+def test_instances_are_interned_on_normalized_id():
+    assert Mouse('366122') is Mouse(366122)
+    assert Mouse(366122).id == 366122
+
+
+def test_instances_are_interned_per_class():
+    user, project = User('366122'), Project('366122')
+    assert user is not project
+    assert user.__class__ is User
+    assert project.__class__ is Project
+    assert Mouse(366122) is not user
+
+
+@pytest.mark.parametrize(
+    'obj', [Mouse(366122), User('ben.hardcastle'), Project('DR')]
+)
+def test_copies_are_the_interned_instance(obj):
+    assert pickle.loads(pickle.dumps(obj)) is obj
+    assert copy.copy(obj) is obj
+    assert copy.deepcopy(obj) is obj
+
+
+def test_prefetch_tolerates_failed_fetch(monkeypatch):
+    fetched = []
+
+    def fetch(self):
+        if self.np_id == 2:
+            raise ConnectionError('lims down')
+        fetched.append(self.np_id)
+
+    monkeypatch.setattr(info.LIMS2InfoBaseClass, 'fetch', fetch)
+    Mouse.prefetch([1, 2, 3])
+    assert sorted(fetched) == [1, 3]
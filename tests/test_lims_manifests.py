@@ -0,0 +1,89 @@
+import pytest
+
+from np_session.components.lims_manifests import Manifest
+
+# representative of the manifest globs on ZK, plus sorted data globs as built
+# by `Manifest.get_sorted_data`
+GLOBS = (
+    '*.sync',
+    '*.behavior.pkl',
+    '*.mapping.pkl',
+    '*_surface-image1-left.png',
+    '*platformD1.json',
+    '*_probeABC',
+    '*_probeABC/*/settings.xml',
+    '*_probeA_sorted',
+    '*_probeA_sorted/continuous/Neuropix-PXI-100.0/spike_times.npy',
+    '**/continuous.dat',
+    '*.missing',
+)
+
+SESSION = '1246096278_366122_20230209'
+
+
+@pytest.fixture
+def session_dir(tmp_path):
+    for name in (
+        f'{SESSION}.sync',
+        f'.{SESSION}.sync',  # hidden: matched by `pathlib.Path.glob` too
+        f'{SESSION}.behavior.pkl',
+        f'{SESSION}.mapping.pkl',
+        f'{SESSION}_surface-image1-left.png',
+        f'{SESSION}_platformD1.json',
+        f'old_{SESSION}_platformD1.json',
+        f'{SESSION}_probeABC.txt',
+    ):
+        (tmp_path / name).touch()
+    for name in (
+        f'{SESSION}.sync.d',
+        f'{SESSION}_probeABC/Record Node 101',
+        f'{SESSION}_probeABC/Record Node 102',
+        f'{SESSION}_probeA_sorted/continuous/Neuropix-PXI-100.0',
+        # a dir matching a pattern for files
+        f'{SESSION}.mapping.pkl.d/other.pkl',
+        'stale.behavior.pkl',
+    ):
+        (tmp_path / name).mkdir(parents=True)
+    for name in (
+        f'{SESSION}_probeABC/Record Node 101/settings.xml',
+        f'{SESSION}_probeABC/Record Node 102/settings.xml',
+        f'{SESSION}_probeA_sorted/continuous/Neuropix-PXI-100.0/spike_times.npy',
+        f'{SESSION}_probeA_sorted/continuous/Neuropix-PXI-100.0/continuous.dat',
+        'continuous.dat',
+    ):
+        (tmp_path / name).touch()
+    return tmp_path
+
+
+@pytest.mark.parametrize('globs', [GLOBS, GLOBS[::-1]])
+def test_glob_all_matches_pathlib(session_dir, globs):
+    manifest = Manifest.__new__(Manifest)
+    hits = manifest._glob_all(session_dir, globs)
+    assert len(hits) == len(globs)
+    for glob, glob_hits in zip(globs, hits):
+        expected = list(session_dir.glob(glob))
+        assert sorted(glob_hits) == sorted(expected), glob
+        # the first hit is the one used as the manifest path
+        assert glob_hits[:1] == tuple(expected[:1]), glob
+
+
+def test_glob_all_missing_dir(tmp_path):
+    manifest = Manifest.__new__(Manifest)
+    assert manifest._glob_all(tmp_path / 'missing', GLOBS[:2]) == ((), ())
+
+
+def test_glob_all_scans_dir_once(session_dir, monkeypatch):
+    from np_session.components import lims_manifests
+
+    scans = []
+    scandir = lims_manifests.os.scandir
+
+    def counting_scandir(path):
+        scans.append(path)
+        return scandir(path)
+
+    manifest = Manifest.__new__(Manifest)
+    monkeypatch.setattr(lims_manifests.os, 'scandir', counting_scandir)
+    manifest._glob_all(session_dir, GLOBS[:3])
+    manifest._glob_all(session_dir, GLOBS[3:6])
+    assert scans == [session_dir]
@@ -45,6 +45,48 @@ def test_write_read_update(p):
     assert p.workflow_start_time == updated_time
     
 
-    
+def test_mutating_read_contents_does_not_skip_next_write(p):
+    p.InsertionNotes = {'ProbeA': {'depth': 1}}
+    p.read_contents()['InsertionNotes']['ProbeA']['depth'] = 2
+    p.InsertionNotes = {'ProbeA': {'depth': 2}}
+    assert json.loads(p.path.read_text())['InsertionNotes'] == {
+        'ProbeA': {'depth': 2}
+    }
+
+
+def test_non_ascii_written_verbatim(p):
+    p.operatorID = 'björn'
+    assert '"björn"' in p.path.read_text(encoding='utf-8')
+    assert PlatformJson(path=p.path).operatorID == 'björn'
+
+
+def test_unchanged_write_is_skipped(p):
+    p.operatorID = 'ben'
+    mtime = p.path.stat().st_mtime_ns
+    time.sleep(0.01)
+    p.write()
+    assert p.path.stat().st_mtime_ns == mtime
+
+
+def test_write_leaves_no_tmp_file(p):
+    p.operatorID = 'ben'
+    assert p.path.exists()
+    assert not p.path.with_suffix('.json.tmp').exists()
+
+
+def test_write_in_place_if_replace_not_permitted(p, monkeypatch):
+    from np_session.components import platform_json
+
+    p.operatorID = 'ben'
+
+    def replace(src, dst):
+        raise PermissionError(dst)
+
+    monkeypatch.setattr(platform_json.os, 'replace', replace)
+    p.operatorID = 'sam'
+    assert json.loads(p.path.read_text())['operatorID'] == 'sam'
+    assert not p.path.with_suffix('.json.tmp').exists()
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
\ No newline at end of file
@@ -0,0 +1,85 @@
+import pytest
+
+from np_session.databases.redis_state import State
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def hset(self, name, key, value):
+        self.commands.append(('hset', name, key, value))
+
+    def hdel(self, name, key):
+        self.commands.append(('hdel', name, key))
+
+    def hgetall(self, name):
+        self.commands.append(('hgetall', name))
+
+    def execute(self):
+        self.redis.executed.append(self.commands)
+        return [getattr(self.redis, cmd)(*args) for cmd, *args in self.commands]
+
+
+class FakeRedis:
+    """Stands in for a `redis.Redis` client: values are stored as bytes."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.executed = []
+        """Commands sent in each pipeline."""
+
+    def hget(self, name, key):
+        return self.hashes.get(name, {}).get(key.encode())
+
+    def hgetall(self, name):
+        return dict(self.hashes.get(name, {}))
+
+    def hset(self, name, key, value):
+        self.hashes.setdefault(name, {})[key.encode()] = str(value).encode()
+
+    def hdel(self, name, key):
+        self.hashes.get(name, {}).pop(key.encode(), None)
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeRedis()
+    monkeypatch.setattr(State, 'db', db, raising=False)
+    return db
+
+
+def test_batched_writes_are_deferred_to_one_pipeline(db):
+    db.hset('1', 'old', 0)
+    with State(1) as state:
+        state['a'] = 1
+        state['b'] = True
+        del state['old']
+        del state['missing']
+        assert db.executed == []
+        assert db.hashes['1'] == {b'old': b'0'}
+        assert dict(state) == {'a': 1, 'b': True}
+    assert db.executed == [
+        [
+            ('hset', '1', 'a', '1'),
+            ('hset', '1', 'b', 'True'),
+            ('hdel', '1', 'old'),
+            ('hdel', '1', 'missing'),
+        ]
+    ]
+    assert State(1).data == {'a': 1, 'b': True}
+
+
+def test_batch_is_discarded_on_error(db):
+    db.hset('1', 'old', 0)
+    with pytest.raises(RuntimeError):
+        with State(1) as state:
+            state['a'] = 1
+            del state['old']
+            raise RuntimeError
+    assert db.executed == []
+    assert State(1).data == {'old': 0}